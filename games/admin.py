@@ -1,7 +1,19 @@
 from django.contrib import admin
-from .models import Game, Tag, Genre
+from .models import Game, GameDetail, Tag, Genre, SteamApp, SteamCatalogSync, SteamPayload
+
+
+class GameDetailInline(admin.StackedInline):
+    model = GameDetail
+
+
+@admin.register(Game)
+class GameAdmin(admin.ModelAdmin):
+    inlines = [GameDetailInline]
+
 
 # Register your models here.
-admin.site.register(Game)
 admin.site.register(Tag)
 admin.site.register(Genre)
+admin.site.register(SteamApp)
+admin.site.register(SteamCatalogSync)
+admin.site.register(SteamPayload)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class GamesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'games'
+
+    def ready(self):
+        import games.signals  # noqa: F401
+        from django.db.models.signals import post_migrate
+
+        from games.fulltext import restore_sqlite_triggers
+        post_migrate.connect(restore_sqlite_triggers, sender=self)
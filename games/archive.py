@@ -0,0 +1,86 @@
+"""
+Archive of raw Steam appdetails payloads in SteamPayload.
+Every ingested game keeps its full payload (price, metacritic,
+publishers, screenshots, ...) compressed in the DB, so new Game fields
+can be re-derived from it locally with `manage.py rederive_games`.
+"""
+import hashlib
+import json
+import zlib
+
+from django.utils import timezone
+
+from games.models import SteamPayload
+
+COMPRESSION_LEVEL = 6
+REDERIVE_BATCH_SIZE = 500
+
+
+def canonical_json(info):
+    """Stable JSON encoding of a payload: equal payloads, equal bytes"""
+    return json.dumps(info, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def pack_payload(info):
+    """Return (compressed data, content hash) for one appdetails data dict"""
+    raw = canonical_json(info)
+    return zlib.compress(raw, COMPRESSION_LEVEL), hashlib.sha256(raw).hexdigest()
+
+
+def unpack_payload(data):
+    return json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+
+
+def archive_payloads(infos, fetched_at=None):
+    """
+    Upsert the payloads of the given appdetails data dicts (one query).
+    They must be the data exactly as Steam sent it, as returned by
+    games.steam_cache.get_app_details_entry() or read from an ingest file, so the
+    same response always archives to the same bytes and hash.
+    fetched_at is when Steam sent them (default now); payloads from the
+    cache pass the fetch time from get_app_details_entry().
+    """
+    fetched_at = fetched_at or timezone.now()
+    rows = {}
+    for info in infos:
+        try:
+            appid = int(info['steam_appid'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        data, content_hash = pack_payload(info)
+        rows[appid] = SteamPayload(appid=appid, data=data, content_hash=content_hash, fetched_at=fetched_at)
+    if rows:
+        SteamPayload.objects.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=['appid'],
+            update_fields=['data', 'content_hash', 'fetched_at'],
+        )
+    return len(rows)
+
+
+def archive_payload(info, fetched_at=None):
+    """Archive a single appdetails data dict"""
+    archive_payloads([info], fetched_at=fetched_at)
+
+
+def iter_archived_payloads(queryset=None, batch_size=REDERIVE_BATCH_SIZE):
+    """
+    Yield the decoded payloads of queryset (all archived payloads by
+    default) in appid order, reading batch_size rows per query.
+    """
+    if queryset is None:
+        queryset = SteamPayload.objects.all()
+    queryset = queryset.order_by('appid').only('appid', 'data')
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(appid__gt=last)
+        rows = list(page[:batch_size])
+        if not rows:
+            return
+        for row in rows:
+            try:
+                yield unpack_payload(row.data)
+            except (zlib.error, ValueError):
+                continue  # Unreadable row; the next ingest replaces it
+        last = rows[-1].appid
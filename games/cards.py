@@ -0,0 +1,72 @@
+"""
+Serialization of DB games into the card/detail dicts the templates and
+the infinite-scroll API expect. Genres and tags for a whole page are
+loaded with one query each instead of two queries per game.
+"""
+from django.db.models import Prefetch
+
+from games.models import Game, GameDetail, Genre, Tag, platform_flags
+
+# Game columns a list card needs; descriptions and requirements stay in the DB
+CARD_FIELDS = ('game_id', 'title', 'image', 'short_description', 'platforms')
+
+CARD_PREFETCH = (
+    Prefetch('genres', queryset=Genre.objects.only('genre_id', 'genre').order_by('genre_id')),
+    Prefetch('tags', queryset=Tag.objects.only('tag_id', 'name').order_by('tag_id')),
+)
+
+
+def card_queryset(queryset):
+    """Restrict a Game queryset to card columns and prefetch its labels"""
+    return queryset.only(*CARD_FIELDS).prefetch_related(*CARD_PREFETCH)
+
+
+def game_card(game):
+    """Card dict for one Game whose genres/tags were prefetched"""
+    return {
+        'appid': game.game_id,
+        'game_id': game.game_id,
+        'title': game.title,
+        'image': game.image,
+        'short_description': game.short_description,
+        'platforms': platform_flags(game.platforms),
+        'genres': [{'id': genre.genre_id, 'description': genre.genre} for genre in game.genres.all()],
+        'tags': [{'id': tag.tag_id, 'description': tag.name} for tag in game.tags.all()],
+    }
+
+
+def game_cards(games):
+    """Card dicts for an iterable of Games loaded through card_queryset()"""
+    return [game_card(game) for game in games]
+
+
+def game_cards_by_id(game_ids):
+    """Card dicts for the given game ids, in that order; missing ids are skipped"""
+    if not game_ids:
+        return []
+    games = card_queryset(Game.objects.filter(game_id__in=game_ids)).in_bulk()
+    return [game_card(games[game_id]) for game_id in game_ids if game_id in games]
+
+
+def game_detail_dict(game):
+    """Detail page dict for one Game loaded with CARD_PREFETCH and its detail"""
+    card = game_card(game)
+    try:
+        detail = game.detail
+    except GameDetail.DoesNotExist:
+        detail = GameDetail(game=game)
+    return {
+        'appid': card['appid'],
+        'title': card['title'],
+        'developer': game.developer,
+        'release_date': game.release_date,
+        'image': card['image'],
+        'description': game.short_description or detail.excerpt,
+        'detailed_description': detail.long_description,
+        'genres': card['genres'],
+        'tags': card['tags'],
+        'platforms': card['platforms'],
+        'pc_requirements_minimum': detail.pc_requirements_minimum,
+        'mac_requirements_minimum': detail.mac_requirements_minimum,
+        'linux_requirements_minimum': detail.linux_requirements_minimum,
+    }
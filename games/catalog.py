@@ -0,0 +1,130 @@
+"""
+Local Steam catalog: syncing the SteamApp table from GetAppList and
+reading it back for the search index and the game list views.
+"""
+import json
+import unicodedata
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from games import steam_client
+from games.models import SteamApp, SteamCatalogSync
+
+CATALOG_VERSION_CACHE_KEY = 'steam_catalog_version'
+# Short TTL: the version is re-read from the DB at most once a minute per
+# process, so a sync run by another process is picked up quickly.
+CATALOG_VERSION_TTL = 60
+SYNC_BATCH_SIZE = 1000
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and collapse whitespace for matching"""
+    text = name or ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+def load_app_list(source=None, timeout=None):
+    """
+    Load a GetAppList payload from a URL or a local JSON file.
+    Accepts either Steam's {'applist': {'apps': [...]}} shape or a bare list.
+    """
+    source = source or steam_client.APP_LIST_URL
+    if source.startswith(('http://', 'https://')):
+        return steam_client.get_app_list(source, timeout=timeout)
+    with open(source, encoding='utf-8') as fh:
+        data = json.load(fh)
+    if isinstance(data, dict):
+        data = data.get('applist', {}).get('apps', [])
+    return data
+
+
+def sync_catalog(apps, batch_size=SYNC_BATCH_SIZE):
+    """
+    Apply the difference between apps and the SteamApp table.
+    Only new, renamed and removed apps are written (so last_changed is the
+    last run that added or renamed an app); returns the SteamCatalogSync
+    row describing the run.
+    """
+    started_at = timezone.now()
+
+    incoming = {}
+    for app in apps:
+        try:
+            appid = int(app.get('appid') or 0)
+        except (TypeError, ValueError):
+            continue
+        name = (app.get('name') or '').strip()
+        if appid > 0 and name:
+            incoming[appid] = name
+
+    existing = dict(SteamApp.objects.values_list('appid', 'name'))
+
+    added = []
+    renamed = []
+    for appid, name in incoming.items():
+        old_name = existing.get(appid)
+        if old_name is None:
+            added.append(SteamApp(
+                appid=appid,
+                name=name,
+                normalized_name=normalize_name(name)[:255],
+                first_seen=started_at,
+                last_changed=started_at,
+            ))
+        elif old_name != name:
+            renamed.append(SteamApp(
+                appid=appid,
+                name=name,
+                normalized_name=normalize_name(name)[:255],
+                last_changed=started_at,
+            ))
+    removed = [appid for appid in existing if appid not in incoming]
+
+    with transaction.atomic():
+        SteamApp.objects.bulk_create(added, batch_size=batch_size)
+        SteamApp.objects.bulk_update(
+            renamed, ['name', 'normalized_name', 'last_changed'], batch_size=batch_size
+        )
+        for i in range(0, len(removed), batch_size):
+            SteamApp.objects.filter(appid__in=removed[i:i + batch_size]).delete()
+        # Unchanged apps are not touched: SteamCatalogSync records every run
+        sync = SteamCatalogSync.objects.create(
+            started_at=started_at,
+            finished_at=timezone.now(),
+            added=len(added),
+            updated=len(renamed),
+            removed=len(removed),
+        )
+
+    cache.delete(CATALOG_VERSION_CACHE_KEY)
+    return sync
+
+
+def get_catalog_version():
+    """Id of the latest sync that changed the catalog (0 if never synced)"""
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if version is None:
+        version = (
+            SteamCatalogSync.objects
+            .exclude(added=0, updated=0, removed=0)
+            .order_by('-pk')
+            .values_list('pk', flat=True)
+            .first()
+        ) or 0
+        cache.set(CATALOG_VERSION_CACHE_KEY, version, CATALOG_VERSION_TTL)
+    return version
+
+
+def iter_catalog_apps(chunk_size=5000):
+    """Yield every SteamApp as an {'appid', 'name', 'normalized_name'} dict"""
+    return (
+        SteamApp.objects
+        .order_by('appid')
+        .values('appid', 'name', 'normalized_name')
+        .iterator(chunk_size=chunk_size)
+    )
@@ -0,0 +1,84 @@
+"""
+Circuit breaker for outbound Steam calls, with its state in the shared
+cache so every worker trips and recovers together.
+After FAILURE_THRESHOLD outage failures within FAILURE_WINDOW seconds
+the circuit opens: calls are refused immediately instead of waiting out
+their timeouts. While open, one worker at a time runs a probe on the
+shared fetch pool every PROBE_INTERVAL seconds; the first successful
+probe closes the circuit.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+
+from games.scheduler import get_executor
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 8
+FAILURE_WINDOW = 30  # seconds
+PROBE_INTERVAL = 15  # seconds
+# Safety net: an open circuit nobody probes closes on its own eventually
+MAX_OPEN = 3600  # seconds
+
+
+class CircuitBreaker:
+    """
+    Shared-state circuit breaker. probe() is called in the background
+    while the circuit is open and must raise if the service is still down.
+    """
+
+    def __init__(self, name, probe):
+        self.name = name
+        self.probe = probe
+        self.open_key = f'circuit_{name}_open'
+        self.failures_key = f'circuit_{name}_failures'
+        self.probe_key = f'circuit_{name}_probing'
+
+    def is_open(self):
+        return cache.get(self.open_key) is not None
+
+    def allow(self):
+        """
+        Return True if a call may go out. While the circuit is open this
+        returns False and makes sure a background probe is scheduled.
+        """
+        if not self.is_open():
+            return True
+        self._schedule_probe()
+        return False
+
+    def record_success(self):
+        # Only consecutive failures count towards opening
+        if cache.get(self.failures_key):
+            cache.delete(self.failures_key)
+
+    def record_failure(self):
+        cache.add(self.failures_key, 0, FAILURE_WINDOW)
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(self.failures_key, 1, FAILURE_WINDOW)
+            failures = 1
+        if failures >= FAILURE_THRESHOLD and cache.add(self.open_key, time.time(), MAX_OPEN):
+            logger.warning('%s circuit opened after %s failures', self.name, failures)
+
+    def close(self):
+        cache.delete_many([self.open_key, self.failures_key])
+
+    def _schedule_probe(self):
+        # The probe lock is left to expire so probes are PROBE_INTERVAL apart
+        if not cache.add(self.probe_key, 1, PROBE_INTERVAL):
+            return
+        get_executor().submit(self._run_probe)
+
+    def _run_probe(self):
+        try:
+            self.probe()
+        except Exception as e:
+            logger.info('%s circuit probe failed: %s', self.name, e)
+            return
+        logger.warning('%s circuit closed, probe succeeded', self.name)
+        self.close()
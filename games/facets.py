@@ -0,0 +1,251 @@
+"""
+In-process bitmap index over the genres, tags and platforms of DB games.
+Each facet value is a packed NumPy bitset with one bit per game, so AND
+filters are bitwise ANDs and the counts of every other facet value for
+the matched games come out of the same pass.
+"""
+import copy
+import threading
+import time
+
+import numpy as np
+
+from games.generations import UNSHARED_MAX_AGE, changes_between, get_generation
+from games.models import PLATFORM_BITS, Game
+
+# Above this many changed games a full rebuild is cheaper than patching
+FACET_PATCH_LIMIT = 5000
+
+WORD_BITS = 64
+
+
+def _words(bits):
+    return (bits + WORD_BITS - 1) // WORD_BITS
+
+
+def _platform_names(mask):
+    return [name for name, bit in PLATFORM_BITS.items() if mask & bit]
+
+
+class FacetResult:
+    """Games matching a facet query and the facet counts within them"""
+
+    def __init__(self, game_ids, genre_counts, tag_counts, platform_counts):
+        self.game_ids = game_ids
+        self.genre_counts = genre_counts
+        self.tag_counts = tag_counts
+        self.platform_counts = platform_counts
+
+    def __len__(self):
+        return len(self.game_ids)
+
+
+class _Facet:
+    """Bitsets of one facet: value -> row of a (values x words) uint64 matrix"""
+
+    def __init__(self, words):
+        self.rows = {}
+        self.bits = np.zeros((0, words), dtype=np.uint64)
+
+    def row(self, value):
+        row = self.rows.get(value)
+        if row is None:
+            row = self.rows[value] = len(self.rows)
+            if row >= len(self.bits):
+                grown = np.zeros((max(8, 2 * len(self.bits)), self.bits.shape[1]), dtype=np.uint64)
+                grown[:len(self.bits)] = self.bits
+                self.bits = grown
+        return row
+
+    def resize(self, words):
+        grown = np.zeros((len(self.bits), words), dtype=np.uint64)
+        grown[:, :self.bits.shape[1]] = self.bits
+        self.bits = grown
+
+    def set(self, value, position):
+        row = self.row(value)  # may grow self.bits
+        word, bit = divmod(position, WORD_BITS)
+        self.bits[row, word] |= np.uint64(1 << bit)
+
+    def clear(self, position):
+        word, bit = divmod(position, WORD_BITS)
+        self.bits[:len(self.rows), word] &= ~np.uint64(1 << bit)
+
+    def get(self, value):
+        """Bitset for value, or None if no game has it"""
+        row = self.rows.get(value)
+        return None if row is None else self.bits[row]
+
+    def counts(self, mask):
+        """value -> number of games in mask that have it"""
+        if not self.rows:
+            return {}
+        totals = np.bitwise_count(self.bits[:len(self.rows)] & mask).sum(axis=1)
+        return {value: int(totals[row]) for value, row in self.rows.items() if totals[row]}
+
+
+class FacetIndex:
+    """
+    Bitmap index of Game rows by genre id, tag id and platform.
+    Bit positions are assigned in insertion order and never reused while
+    the index lives; removed games are simply cleared from every bitset.
+    """
+
+    def __init__(self, capacity=0):
+        words = _words(max(capacity, WORD_BITS))
+        self.game_ids = np.zeros(words * WORD_BITS, dtype=np.int64)
+        self.positions = {}
+        self.live = np.zeros(words, dtype=np.uint64)
+        self.genres = _Facet(words)
+        self.tags = _Facet(words)
+        self.platforms = _Facet(words)
+
+    @classmethod
+    def build(cls):
+        """Build the index for every Game (three queries)"""
+        games = list(Game.objects.values_list('game_id', 'platforms'))
+        index = cls(capacity=len(games))
+        index._load(
+            games,
+            Game.genres.through.objects.values_list('game_id', 'genre_id'),
+            Game.tags.through.objects.values_list('game_id', 'tag_id'),
+        )
+        return index
+
+    def update(self, game_ids):
+        """Reload the given games from the DB, dropping any that were deleted"""
+        game_ids = list(game_ids)
+        for game_id in game_ids:
+            self._clear(game_id)
+        self._load(
+            Game.objects.filter(game_id__in=game_ids).values_list('game_id', 'platforms'),
+            Game.genres.through.objects.filter(game_id__in=game_ids).values_list('game_id', 'genre_id'),
+            Game.tags.through.objects.filter(game_id__in=game_ids).values_list('game_id', 'tag_id'),
+        )
+
+    def _load(self, games, genre_rows, tag_rows):
+        for game_id, platforms in games:
+            position = self._position(game_id)
+            word, bit = divmod(position, WORD_BITS)
+            self.live[word] |= np.uint64(1 << bit)
+            for name in _platform_names(platforms):
+                self.platforms.set(name, position)
+        for game_id, genre_id in genre_rows:
+            self.genres.set(genre_id, self.positions[game_id])
+        for game_id, tag_id in tag_rows:
+            self.tags.set(tag_id, self.positions[game_id])
+
+    def _position(self, game_id):
+        position = self.positions.get(game_id)
+        if position is None:
+            position = self.positions[game_id] = len(self.positions)
+            if position >= len(self.game_ids):
+                self._resize(2 * len(self.live))
+            self.game_ids[position] = game_id
+        return position
+
+    def _resize(self, words):
+        game_ids = np.zeros(words * WORD_BITS, dtype=np.int64)
+        game_ids[:len(self.game_ids)] = self.game_ids
+        self.game_ids = game_ids
+        live = np.zeros(words, dtype=np.uint64)
+        live[:len(self.live)] = self.live
+        self.live = live
+        for facet in (self.genres, self.tags, self.platforms):
+            facet.resize(words)
+
+    def _clear(self, game_id):
+        position = self.positions.get(game_id)
+        if position is None:
+            return
+        word, bit = divmod(position, WORD_BITS)
+        self.live[word] &= ~np.uint64(1 << bit)
+        for facet in (self.genres, self.tags, self.platforms):
+            facet.clear(position)
+
+    def __len__(self):
+        return int(np.bitwise_count(self.live).sum())
+
+    def _mask_of(self, game_ids):
+        positions = [self.positions[game_id] for game_id in game_ids if game_id in self.positions]
+        bits = np.zeros(len(self.live) * WORD_BITS, dtype=np.uint8)
+        bits[positions] = 1
+        return np.packbits(bits, bitorder='little').view('<u8').astype(np.uint64)
+
+    def query(self, genres=(), tags=(), platform='', within=None):
+        """
+        AND together the selected genre ids, tag ids and platform name,
+        optionally restricted to the game ids in within (e.g. a title search).
+        Unknown values match nothing. Returns a FacetResult whose game_ids
+        are sorted ascending.
+        """
+        mask = self.live.copy()
+        if within is not None:
+            mask &= self._mask_of(within)
+        selections = [(self.genres, value) for value in genres]
+        selections += [(self.tags, value) for value in tags]
+        if platform:
+            selections.append((self.platforms, platform.lower()))
+        for facet, value in selections:
+            if facet is not self.platforms:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    value = None
+            bits = facet.get(value)
+            if bits is None:
+                mask[:] = 0
+                break
+            mask &= bits
+
+        positions = np.flatnonzero(np.unpackbits(mask.astype('<u8').view(np.uint8), bitorder='little'))
+        return FacetResult(
+            np.sort(self.game_ids[positions]),
+            self.genres.counts(mask),
+            self.tags.counts(mask),
+            self.platforms.counts(mask),
+        )
+
+
+# (generation, built_at, index), swapped as a whole
+_state = (None, 0.0, None)
+_lock = threading.Lock()
+
+
+def _current(generation):
+    built_for, built_at, index = _state
+    if index is not None and built_for == generation and time.monotonic() - built_at < UNSHARED_MAX_AGE:
+        return index
+    return None
+
+
+def get_facet_index():
+    """
+    The facet index for the current DB games. After Game writes it is
+    patched with the games the generation bumps recorded, or rebuilt when
+    they are unknown or too many; it is also rebuilt every
+    UNSHARED_MAX_AGE seconds.
+    """
+    global _state
+    index = _current(get_generation('games'))
+    if index is not None:
+        return index
+    with _lock:
+        # Another thread may have brought it up to date while this one waited
+        generation = get_generation('games')
+        index = _current(generation)
+        if index is not None:
+            return index
+        built_for, built_at, index = _state
+        changed = None
+        if index is not None and time.monotonic() - built_at < UNSHARED_MAX_AGE:
+            changed = changes_between('games', built_for, generation)
+        if changed is not None and len(changed) <= FACET_PATCH_LIMIT:
+            # Readers keep using the old index until the patched copy is swapped in
+            index = copy.deepcopy(index)
+            index.update(changed)
+            _state = (generation, built_at, index)
+        else:
+            index = FacetIndex.build()
+            _state = (generation, time.monotonic(), index)
+    return index
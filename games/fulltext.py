@@ -0,0 +1,132 @@
+"""
+Ranked full-text search over DB games.
+PostgreSQL matches against Game.search_vector (GIN indexed); SQLite uses
+the games_game_fts FTS5 shadow table. Both are kept current by triggers
+created in migration 0008, so bulk ingestion needs no extra work.
+Title matches rank above developer matches, which rank above description
+matches. Other backends fall back to an unranked title__icontains.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, connections
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.db.models.expressions import RawSQL
+
+from games.models import Game
+
+# Text search configuration of the PostgreSQL search vector
+SEARCH_CONFIG = 'english'
+
+# FTS5 shadow table and bm25 column weights (title, developer, short_description)
+FTS_TABLE = 'games_game_fts'
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Same triggers as migration 0008. SQLite drops them whenever a migration
+# rebuilds games_game, so they are restored after every migrate.
+SQLITE_TRIGGERS = {
+    'games_game_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS games_game_fts_insert AFTER INSERT ON games_game BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, developer, short_description)
+            VALUES (new.game_id, new.title, new.developer, new.short_description);
+        END
+    """,
+    'games_game_fts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS games_game_fts_delete AFTER DELETE ON games_game BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, developer, short_description)
+            VALUES ('delete', old.game_id, old.title, old.developer, old.short_description);
+        END
+    """,
+    'games_game_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS games_game_fts_update AFTER UPDATE ON games_game BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, developer, short_description)
+            VALUES ('delete', old.game_id, old.title, old.developer, old.short_description);
+            INSERT INTO {FTS_TABLE}(rowid, title, developer, short_description)
+            VALUES (new.game_id, new.title, new.developer, new.short_description);
+        END
+    """,
+}
+
+
+def search_terms(query):
+    """Words of a user query, lowercased; punctuation is dropped"""
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _fts5_query(terms):
+    # Every word must match, the last one possibly still being typed
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _tsquery(terms):
+    return ' & '.join(f"'{term}':*" for term in terms)
+
+
+def search_games(query, queryset=None):
+    """
+    Restrict queryset (all games by default) to games matching query,
+    annotated with search_rank and ordered best match first.
+    """
+    if queryset is None:
+        queryset = Game.objects.all()
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == 'postgresql':
+        tsquery = SearchQuery(_tsquery(terms), config=SEARCH_CONFIG, search_type='raw')
+        # ts_rank() is float4, which psycopg reads back rounded; as float8
+        # the rank round-trips exactly, so keyset cursors can compare it
+        return (
+            queryset
+            .filter(search_vector=tsquery)
+            .annotate(search_rank=Cast(SearchRank(F('search_vector'), tsquery), FloatField()))
+            .order_by('-search_rank', 'game_id')
+        )
+
+    if connection.vendor == 'sqlite':
+        match = _fts5_query(terms)
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        # bm25() is lower for better matches; negate it so higher is better
+        # as on PostgreSQL
+        return (
+            queryset
+            .filter(game_id__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match],
+            ))
+            .annotate(search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = games_game.game_id',
+                [match],
+            ))
+            .order_by('-search_rank', 'game_id')
+        )
+
+    return queryset.filter(title__icontains=query)
+
+
+def restore_sqlite_triggers(using='default', **kwargs):
+    """
+    post_migrate handler: recreate missing FTS5 triggers and reindex, since
+    the shadow table missed every write made while they were gone.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+        if cursor.fetchone() is None:
+            return  # migration 0008 not applied
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'games_game'"
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+        missing = [sql for name, sql in SQLITE_TRIGGERS.items() if name not in existing]
+        if not missing:
+            return
+        for sql in missing:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
@@ -0,0 +1,88 @@
+"""
+Generation counters for cache invalidation.
+Cached data derived from a table embeds the table's generation; writes
+bump it, so stale entries are simply never read again.
+A bump can also record which rows it changed, so in-process indexes can
+be patched instead of rebuilt (see changes_between()).
+"""
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# How long the rows changed by a bump stay recorded
+CHANGE_LOG_TTL = 600
+# Bumps one changes_between() call looks back over at most
+CHANGE_LOG_MAX_STEPS = 100
+# Upper bound on staleness of anything keyed on a generation when the
+# cache is not shared between workers (see generations_shared())
+UNSHARED_MAX_AGE = 300
+
+
+def _key(name):
+    return f'generation_{name}'
+
+
+def _changes_key(name, generation):
+    return f'generation_{name}_{generation}_changes'
+
+
+def get_generation(name):
+    """Return the current generation number for name"""
+    value = cache.get(_key(name))
+    if value is None:
+        # Seed from the clock so a cache flush never reuses an old number
+        cache.add(_key(name), time.time_ns(), None)
+        value = cache.get(_key(name), time.time_ns())
+    return value
+
+
+def bump_generation(name, changed=None):
+    """
+    Invalidate everything cached against the current generation of name.
+    changed, if given, is the ids of the rows this bump is for.
+    """
+    try:
+        generation = cache.incr(_key(name))
+    except ValueError:
+        # Counter lost: nothing can be patched across this bump
+        cache.set(_key(name), time.time_ns(), None)
+        return
+    if changed is not None:
+        cache.set(_changes_key(name, generation), list(changed), CHANGE_LOG_TTL)
+
+
+def changes_between(name, since, until):
+    """
+    Set of row ids changed by the bumps after generation `since` up to
+    `until`, or None if any of those bumps did not record its changes.
+    """
+    if not isinstance(since, int) or not isinstance(until, int):
+        return None
+    if not 0 < until - since <= CHANGE_LOG_MAX_STEPS:
+        return None
+    keys = [_changes_key(name, generation) for generation in range(since + 1, until + 1)]
+    logged = cache.get_many(keys)
+    if len(logged) != len(keys):
+        return None
+    return {row_id for key in keys for row_id in logged[key]}
+
+
+def generations_shared():
+    """
+    True when every worker sees every bump. With a per-process cache a
+    bump is only seen by the worker that made it, so entries keyed on a
+    generation also need a finite lifetime (UNSHARED_MAX_AGE).
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+# Generations that together version everything derived from the DB catalog:
+# 'games' (Game rows and their genre/tag links) and 'labels' (Genre/Tag rows)
+CATALOG_GENERATIONS = ('games', 'labels')
+
+
+def get_catalog_generation():
+    """Combined generation of the DB catalog, for keys derived from all of it"""
+    return '-'.join(str(get_generation(name)) for name in CATALOG_GENERATIONS)
@@ -0,0 +1,191 @@
+"""
+Bulk ingestion of Steam appdetails payloads into Game, Genre and Tag.
+Each batch costs a fixed number of queries regardless of its size.
+"""
+import json
+
+from django.db import transaction
+
+from games.archive import archive_payloads
+from games.generations import bump_generation
+from games.models import Game, GameDetail, Genre, Tag, map_steam_to_game, map_steam_to_game_detail
+
+INGEST_BATCH_SIZE = 500
+
+# Game columns refreshed when an ingested appid already exists.
+# submitted_by is left alone so the original submitter is kept.
+GAME_UPDATE_FIELDS = [
+    'title',
+    'image',
+    'short_description',
+    'release_date',
+    'developer',
+    'age_rating',
+    'platforms',
+]
+# GameDetail columns refreshed from appdetails
+DETAIL_UPDATE_FIELDS = [
+    'long_description',
+    'pc_requirements_minimum',
+    'mac_requirements_minimum',
+    'linux_requirements_minimum',
+    'excerpt',
+]
+
+
+def extract_appdetails(obj):
+    """
+    Return the appdetails `data` dict from one payload, or None.
+    Accepts a raw appdetails response ({"<appid>": {"success": ..., "data": ...}})
+    or the `data` dict on its own.
+    """
+    if not isinstance(obj, dict):
+        return None
+    if 'steam_appid' in obj:
+        return obj
+    if len(obj) == 1:
+        app_data = next(iter(obj.values()))
+        if isinstance(app_data, dict) and app_data.get('success'):
+            info = app_data.get('data')
+            if isinstance(info, dict) and info.get('steam_appid'):
+                return info
+    return None
+
+
+def iter_jsonl_payloads(lines):
+    """Yield appdetails data dicts from JSON lines, skipping bad lines"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            info = extract_appdetails(json.loads(line))
+        except ValueError:
+            continue
+        if info is not None:
+            yield info
+
+
+def _collect_labels(infos, key):
+    """Map appid -> [label ids] and label id -> description for genres/categories"""
+    labels = {}
+    per_game = {}
+    for appid, info in infos.items():
+        ids = []
+        for item in info.get(key) or []:
+            try:
+                label_id = int(item['id'])
+                description = str(item['description'])[:100]
+            except (ValueError, TypeError, KeyError):
+                continue  # Skip malformed genre/category data
+            labels.setdefault(label_id, description)
+            if label_id not in ids:
+                ids.append(label_id)
+        per_game[appid] = ids
+    return per_game, labels
+
+
+def _ensure_labels(model, pk_field, name_field, labels):
+    """Insert missing Genre/Tag rows and return the set of ids that exist"""
+    if not labels:
+        return set()
+    model.objects.bulk_create(
+        [model(**{pk_field: pk, name_field: name}) for pk, name in labels.items()],
+        ignore_conflicts=True,
+    )
+    # A label can be skipped above if another id already uses its name
+    return set(
+        model.objects
+        .filter(**{f'{pk_field}__in': list(labels)})
+        .values_list(pk_field, flat=True)
+    )
+
+
+def _replace_m2m(field, game_ids, per_game, valid_ids, target_column):
+    """Rewrite the through rows for one M2M field of the given games"""
+    through = field.through
+    through.objects.filter(game_id__in=game_ids).delete()
+    through.objects.bulk_create([
+        through(**{'game_id': appid, target_column: label_id})
+        for appid in game_ids
+        for label_id in per_game.get(appid, [])
+        if label_id in valid_ids
+    ])
+
+
+def ingest_batch(payloads, user, archive=True):
+    """
+    Upsert one batch of appdetails data dicts, archiving the payloads in
+    SteamPayload unless archive is False (re-deriving from the archive).
+    Returns the number of games written.
+    """
+    infos = {}
+    for info in payloads:
+        fields = map_steam_to_game(info, user=user)
+        if fields['game_id']:
+            # Later payloads for the same appid win
+            infos[fields['game_id']] = (info, fields)
+    if not infos:
+        return 0
+
+    games = [Game(**fields) for _, fields in infos.values()]
+    details = [
+        GameDetail(game_id=appid, **map_steam_to_game_detail(info))
+        for appid, (info, _) in infos.items()
+    ]
+    # Render the raw Steam HTML; bulk_create skips save()
+    for detail in details:
+        detail.render_html()
+    raw = {appid: info for appid, (info, _) in infos.items()}
+    game_ids = list(infos)
+
+    genres_per_game, genre_labels = _collect_labels(raw, 'genres')
+    tags_per_game, tag_labels = _collect_labels(raw, 'categories')
+
+    with transaction.atomic():
+        Game.objects.bulk_create(
+            games,
+            update_conflicts=True,
+            unique_fields=['game_id'],
+            update_fields=GAME_UPDATE_FIELDS,
+        )
+        GameDetail.objects.bulk_create(
+            details,
+            update_conflicts=True,
+            unique_fields=['game'],
+            update_fields=DETAIL_UPDATE_FIELDS,
+        )
+        genre_ids = _ensure_labels(Genre, 'genre_id', 'genre', genre_labels)
+        tag_ids = _ensure_labels(Tag, 'tag_id', 'name', tag_labels)
+        _replace_m2m(Game.genres, game_ids, genres_per_game, genre_ids, 'genre_id')
+        _replace_m2m(Game.tags, game_ids, tags_per_game, tag_ids, 'tag_id')
+        if archive:
+            archive_payloads(raw.values())
+
+    # bulk_create sends no post_save signals. Recording the ids lets the
+    # web workers patch their facet index instead of rebuilding it.
+    bump_generation('games', changed=game_ids)
+    if genre_labels or tag_labels:
+        bump_generation('labels')
+    return len(games)
+
+
+def ingest_payloads(payloads, user, batch_size=INGEST_BATCH_SIZE, progress=None, archive=True):
+    """
+    Ingest a stream of appdetails data dicts in batches.
+    progress, if given, is called with the running total after each batch.
+    """
+    total = 0
+    batch = []
+    for info in payloads:
+        batch.append(info)
+        if len(batch) >= batch_size:
+            total += ingest_batch(batch, user, archive=archive)
+            batch = []
+            if progress:
+                progress(total)
+    if batch:
+        total += ingest_batch(batch, user, archive=archive)
+        if progress:
+            progress(total)
+    return total
@@ -0,0 +1,35 @@
+"""
+Genre and tag choices for the game list filter sidebar.
+Cached under the 'labels' generation, which every Genre or Tag write
+bumps, so the lists are rebuilt only when they actually change. Entries
+only expire when the cache is per-process, where other workers never
+see a bump.
+"""
+from django.core.cache import cache
+
+from games.generations import UNSHARED_MAX_AGE, generations_shared, get_generation
+from games.models import Genre, Tag
+
+
+def _timeout():
+    return None if generations_shared() else UNSHARED_MAX_AGE
+
+
+def genre_choices():
+    """[(genre_id as str, name)] in id order"""
+    key = f"steam_genres_list_{get_generation('labels')}"
+    choices = cache.get(key)
+    if choices is None:
+        choices = [(str(genre_id), name) for genre_id, name in Genre.objects.values_list('genre_id', 'genre')]
+        cache.set(key, choices, _timeout())
+    return choices
+
+
+def tag_choices():
+    """[(tag_id as str, name)] sorted by name"""
+    key = f"steam_tags_list_{get_generation('labels')}"
+    choices = cache.get(key)
+    if choices is None:
+        choices = [(str(tag_id), name) for tag_id, name in Tag.objects.order_by('name').values_list('tag_id', 'name')]
+        cache.set(key, choices, _timeout())
+    return choices
@@ -0,0 +1,69 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from games.ingest import INGEST_BATCH_SIZE, ingest_payloads, iter_jsonl_payloads
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-ingest Steam appdetails payloads (one JSON object per line) "
+        "into Game, Genre and Tag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='JSONL files to read; reads stdin when omitted or "-".',
+        )
+        parser.add_argument(
+            '--user',
+            help=(
+                'Username recorded as submitted_by on new games '
+                '(defaults to the first superuser).'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=INGEST_BATCH_SIZE,
+            help='Games upserted per batch.',
+        )
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User '{username}' does not exist.")
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError("No superuser found; pass --user.")
+        return user
+
+    def iter_lines(self, paths):
+        for path in paths or ['-']:
+            if path == '-':
+                yield from sys.stdin
+            else:
+                try:
+                    with open(path, encoding='utf-8') as fh:
+                        yield from fh
+                except OSError as e:
+                    raise CommandError(f"Could not read {path}: {e}")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+
+        def report(total):
+            self.stdout.write(f"  {total} games ingested...")
+
+        total = ingest_payloads(
+            iter_jsonl_payloads(self.iter_lines(options['paths'])),
+            user,
+            batch_size=options['batch_size'],
+            progress=report,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ingested {total} games."))
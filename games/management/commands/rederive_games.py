@@ -0,0 +1,62 @@
+from django.core.management.base import CommandError
+
+from games.archive import REDERIVE_BATCH_SIZE, iter_archived_payloads
+from games.ingest import ingest_payloads
+from games.management.commands.ingest_steam import Command as IngestCommand
+from games.models import Game, SteamPayload
+
+
+class Command(IngestCommand):
+    help = (
+        "Rebuild Game, GameDetail, Genre and Tag data from the archived "
+        "Steam payloads (SteamPayload), without calling Steam."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'appids',
+            nargs='*',
+            type=int,
+            help='Only re-derive these appids (defaults to every archived game).',
+        )
+        parser.add_argument(
+            '--user',
+            help=(
+                'Username recorded as submitted_by on games that no longer '
+                'exist (defaults to the first superuser).'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=REDERIVE_BATCH_SIZE,
+            help='Payloads read and games upserted per batch.',
+        )
+        parser.add_argument(
+            '--include-missing',
+            action='store_true',
+            help='Also recreate games that have a payload but no Game row.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+        user = self.get_user(options['user'])
+
+        payloads = SteamPayload.objects.all()
+        if options['appids']:
+            payloads = payloads.filter(appid__in=options['appids'])
+        if not options['include_missing']:
+            payloads = payloads.filter(appid__in=Game.objects.values('game_id'))
+
+        def report(total):
+            self.stdout.write(f"  {total} games re-derived...")
+
+        total = ingest_payloads(
+            iter_archived_payloads(payloads, batch_size=options['batch_size']),
+            user,
+            batch_size=options['batch_size'],
+            progress=report,
+            archive=False,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Re-derived {total} games."))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games.catalog import SYNC_BATCH_SIZE, load_app_list, sync_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync the local SteamApp table with Steam's GetAppList. "
+        "Only apps added, renamed or removed since the last run are written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            help=(
+                'URL or path to a GetAppList JSON payload '
+                '(defaults to the live Steam endpoint).'
+            ),
+        )
+        parser.add_argument(
+            '--timeout',
+            type=int,
+            help='HTTP read timeout in seconds when fetching from a URL.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SYNC_BATCH_SIZE,
+            help='Rows per bulk insert/update.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            timeout = options['timeout']
+            apps = load_app_list(
+                options['source'],
+                timeout=(3.05, timeout) if timeout else None,
+            )
+        except Exception as e:
+            raise CommandError(f"Could not load Steam app list: {e}")
+
+        # An empty payload almost always means Steam had a bad moment;
+        # applying it would wipe the whole local catalog.
+        if not apps:
+            raise CommandError("Steam app list is empty; nothing synced.")
+
+        sync = sync_catalog(apps, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Steam catalog synced: {sync.added} added, "
+            f"{sync.updated} renamed, {sync.removed} removed."
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from games.warmup import DEFAULT_PAGES, warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the search, facet and membership indexes and assemble the "
+        "first pages of the games list into the page cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=DEFAULT_PAGES,
+            help='Pages of the default games list to assemble.',
+        )
+
+    def handle(self, *args, **options):
+        last_reported = {}
+
+        def report(stage, done, total):
+            # Report roughly every 10% so long runs stay readable
+            step = max(1, total // 10)
+            if done == total or done - last_reported.get(stage, 0) >= step:
+                last_reported[stage] = done
+                self.stdout.write(f"  {stage}: {done}/{total}")
+
+        stats = warm_caches(
+            pages=options['pages'],
+            progress=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Caches warmed: {stats['catalog']} catalog apps indexed and "
+            f"{stats['pages']} list pages cached."
+        ))
@@ -0,0 +1,32 @@
+"""
+Compact membership index of the appids already stored as Game rows.
+Lets the list views drop DB games from Steam candidates without loading
+any Game instances.
+"""
+import threading
+import time
+
+from games.generations import UNSHARED_MAX_AGE, get_generation
+from games.models import Game
+
+# (generation, built_at, appids), swapped as a whole
+_state = (None, 0.0, frozenset())
+_lock = threading.Lock()
+
+
+def get_db_appids():
+    """frozenset of every Game.game_id, rebuilt after Game writes"""
+    global _state
+    generation = get_generation('games')
+    built_for, built_at, appids = _state
+    if built_for == generation and time.monotonic() - built_at < UNSHARED_MAX_AGE:
+        return appids
+    with _lock:
+        # Another thread may have rebuilt it while this one waited
+        generation = get_generation('games')
+        built_for, built_at, appids = _state
+        if built_for == generation and time.monotonic() - built_at < UNSHARED_MAX_AGE:
+            return appids
+        appids = frozenset(Game.objects.values_list('game_id', flat=True))
+        _state = (generation, time.monotonic(), appids)
+    return appids
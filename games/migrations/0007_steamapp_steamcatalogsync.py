@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_game_linux_requirements_minimum_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SteamApp',
+            fields=[
+                ('appid', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.TextField()),
+                ('normalized_name', models.CharField(db_index=True, max_length=255)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SteamCatalogSync',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('added', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('removed', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
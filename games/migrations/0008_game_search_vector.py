@@ -0,0 +1,92 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+# PostgreSQL: trigger-maintained tsvector column plus a GIN index.
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION games_game_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.developer, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.short_description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER games_game_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, developer, short_description, search_vector ON games_game
+    FOR EACH ROW EXECUTE FUNCTION games_game_search_vector_update()
+    """,
+    "UPDATE games_game SET search_vector = NULL",
+    "CREATE INDEX games_game_search_vector_gin ON games_game USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS games_game_search_vector_gin",
+    "DROP TRIGGER IF EXISTS games_game_search_vector_trigger ON games_game",
+    "DROP FUNCTION IF EXISTS games_game_search_vector_update()",
+]
+
+# SQLite: external-content FTS5 table over games_game, kept in sync by triggers.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE games_game_fts USING fts5(
+        title, developer, short_description,
+        content='games_game', content_rowid='game_id'
+    )
+    """,
+    """
+    CREATE TRIGGER games_game_fts_insert AFTER INSERT ON games_game BEGIN
+        INSERT INTO games_game_fts(rowid, title, developer, short_description)
+        VALUES (new.game_id, new.title, new.developer, new.short_description);
+    END
+    """,
+    """
+    CREATE TRIGGER games_game_fts_delete AFTER DELETE ON games_game BEGIN
+        INSERT INTO games_game_fts(games_game_fts, rowid, title, developer, short_description)
+        VALUES ('delete', old.game_id, old.title, old.developer, old.short_description);
+    END
+    """,
+    """
+    CREATE TRIGGER games_game_fts_update AFTER UPDATE ON games_game BEGIN
+        INSERT INTO games_game_fts(games_game_fts, rowid, title, developer, short_description)
+        VALUES ('delete', old.game_id, old.title, old.developer, old.short_description);
+        INSERT INTO games_game_fts(rowid, title, developer, short_description)
+        VALUES (new.game_id, new.title, new.developer, new.short_description);
+    END
+    """,
+    "INSERT INTO games_game_fts(games_game_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS games_game_fts_update",
+    "DROP TRIGGER IF EXISTS games_game_fts_delete",
+    "DROP TRIGGER IF EXISTS games_game_fts_insert",
+    "DROP TABLE IF EXISTS games_game_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_steamapp_steamcatalogsync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+# Bits as defined in games.models at the time of this migration
+PLATFORM_BITS = {'windows': 1, 'mac': 2, 'linux': 4}
+BATCH_SIZE = 500
+
+
+def platform_string_to_mask(apps, schema_editor):
+    """Backfill Game.platforms from the "Windows, Mac, Linux" string"""
+    Game = apps.get_model('games', 'Game')
+    ids_by_mask = {}
+    for game_id, platform in Game.objects.values_list('game_id', 'platform').iterator():
+        platform = (platform or '').lower()
+        mask = 0
+        for name, bit in PLATFORM_BITS.items():
+            if name in platform:
+                mask |= bit
+        if mask:
+            ids_by_mask.setdefault(mask, []).append(game_id)
+    # One UPDATE per distinct mask (and batch), not one per game
+    for mask, game_ids in ids_by_mask.items():
+        for start in range(0, len(game_ids), BATCH_SIZE):
+            Game.objects.filter(game_id__in=game_ids[start:start + BATCH_SIZE]).update(platforms=mask)
+
+
+def platform_mask_to_string(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    for mask in Game.objects.values_list('platforms', flat=True).distinct():
+        platform = ', '.join(name.capitalize() for name, bit in PLATFORM_BITS.items() if mask & bit)
+        Game.objects.filter(platforms=mask).update(platform=platform)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_game_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='platforms',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(platform_string_to_mask, platform_mask_to_string),
+        migrations.RemoveField(
+            model_name='game',
+            name='platform',
+        ),
+    ]
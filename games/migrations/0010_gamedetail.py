@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+DETAIL_FIELDS = (
+    'long_description',
+    'pc_requirements_minimum',
+    'mac_requirements_minimum',
+    'linux_requirements_minimum',
+)
+BATCH_SIZE = 500
+
+
+def copy_details(apps, schema_editor):
+    """Move the heavy Game columns into GameDetail rows"""
+    Game = apps.get_model('games', 'Game')
+    GameDetail = apps.get_model('games', 'GameDetail')
+    batch = []
+    rows = Game.objects.values_list('game_id', *DETAIL_FIELDS).iterator(chunk_size=BATCH_SIZE)
+    for game_id, *values in rows:
+        if not any(values):
+            continue  # No row needed; the detail page treats it as empty
+        batch.append(GameDetail(game_id=game_id, **dict(zip(DETAIL_FIELDS, values))))
+        if len(batch) >= BATCH_SIZE:
+            GameDetail.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        GameDetail.objects.bulk_create(batch)
+
+
+def restore_details(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    GameDetail = apps.get_model('games', 'GameDetail')
+    games = []
+    for detail in GameDetail.objects.iterator(chunk_size=BATCH_SIZE):
+        games.append(Game(game_id=detail.game_id, **{field: getattr(detail, field) for field in DETAIL_FIELDS}))
+        if len(games) >= BATCH_SIZE:
+            Game.objects.bulk_update(games, DETAIL_FIELDS)
+            games = []
+    if games:
+        Game.objects.bulk_update(games, DETAIL_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_game_platforms_bitmask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameDetail',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='detail', serialize=False, to='games.game')),
+                ('long_description', models.TextField(blank=True)),
+                ('pc_requirements_minimum', models.TextField(blank=True)),
+                ('mac_requirements_minimum', models.TextField(blank=True)),
+                ('linux_requirements_minimum', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(copy_details, restore_details),
+        migrations.RemoveField(
+            model_name='game',
+            name='linux_requirements_minimum',
+        ),
+        migrations.RemoveField(
+            model_name='game',
+            name='long_description',
+        ),
+        migrations.RemoveField(
+            model_name='game',
+            name='mac_requirements_minimum',
+        ),
+        migrations.RemoveField(
+            model_name='game',
+            name='pc_requirements_minimum',
+        ),
+    ]
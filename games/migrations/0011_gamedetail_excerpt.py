@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+from games.richtext import html_excerpt, render_requirements, sanitize_html
+
+BATCH_SIZE = 500
+HTML_FIELDS = (
+    'long_description',
+    'pc_requirements_minimum',
+    'mac_requirements_minimum',
+    'linux_requirements_minimum',
+)
+
+
+def render_details(apps, schema_editor):
+    """Sanitize the stored HTML and fill in excerpts (GameDetail.render_html)"""
+    GameDetail = apps.get_model('games', 'GameDetail')
+    batch = []
+    for detail in GameDetail.objects.iterator(chunk_size=BATCH_SIZE):
+        detail.long_description = sanitize_html(detail.long_description)
+        detail.pc_requirements_minimum = render_requirements(detail.pc_requirements_minimum)
+        detail.mac_requirements_minimum = render_requirements(detail.mac_requirements_minimum)
+        detail.linux_requirements_minimum = render_requirements(detail.linux_requirements_minimum)
+        detail.excerpt = html_excerpt(detail.long_description)
+        batch.append(detail)
+        if len(batch) >= BATCH_SIZE:
+            GameDetail.objects.bulk_update(batch, HTML_FIELDS + ('excerpt',))
+            batch = []
+    if batch:
+        GameDetail.objects.bulk_update(batch, HTML_FIELDS + ('excerpt',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_gamedetail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamedetail',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        # Sanitizing is not undone; the raw HTML is gone
+        migrations.RunPython(render_details, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_gamedetail_excerpt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SteamPayload',
+            fields=[
+                ('appid', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_steampayload'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='steamapp',
+            old_name='last_seen',
+            new_name='last_changed',
+        ),
+    ]
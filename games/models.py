@@ -1,7 +1,41 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from datetime import datetime
 
+from games.richtext import EXCERPT_LENGTH, html_excerpt, render_requirements, sanitize_html
+
+# Platform bits stored in Game.platforms
+WINDOWS = 1
+MAC = 2
+LINUX = 4
+PLATFORM_BITS = {'windows': WINDOWS, 'mac': MAC, 'linux': LINUX}
+
+
+def platform_mask(names):
+    """Bitmask for an iterable of platform names (case-insensitive)"""
+    mask = 0
+    for name in names:
+        mask |= PLATFORM_BITS.get(str(name).lower(), 0)
+    return mask
+
+
+def platform_flags(mask):
+    """{'windows': bool, 'mac': bool, 'linux': bool} for a platform bitmask"""
+    return {name: bool(mask & bit) for name, bit in PLATFORM_BITS.items()}
+
+
+def platform_filter(name):
+    """
+    Q for games available on the named platform. Compiles to an IN over the
+    few bitmasks containing its bit, so the platforms index is used.
+    Unknown names match nothing.
+    """
+    bit = PLATFORM_BITS.get((name or '').lower(), 0)
+    all_bits = sum(PLATFORM_BITS.values())
+    return models.Q(platforms__in=[mask for mask in range(all_bits + 1) if mask & bit])
+
+
 # Game model represents a Steam game in the database.
 # It includes all relevant fields, and links to User, Tag, and Genre.
 
@@ -15,25 +49,83 @@ class Game(models.Model):
     title = models.CharField(max_length=255)
     image = models.CharField(max_length=255, blank=True)
     short_description = models.TextField(blank=True)
-    long_description = models.TextField(blank=True)
     release_date = models.DateField(null=True, blank=True)
     developer = models.CharField(max_length=255, blank=True)
     age_rating = models.CharField(max_length=50, null=True, blank=True)
-    platform = models.CharField(max_length=255, blank=True)
+    # Bitmask of WINDOWS, MAC and LINUX
+    platforms = models.PositiveSmallIntegerField(default=0, db_index=True)
     # ManyToManyField allows each game to have multiple tags and each tag to be linked to multiple games.
     # related_name='games' lets you access all games for a tag using tag.games.all()
     tags = models.ManyToManyField('Tag', related_name='games', blank=True)
     # ManyToManyField allows each game to have multiple genres and each genre to be linked to multiple games.
     # related_name='games' lets you access all games for a genre using genre.games.all()
     genres = models.ManyToManyField('Genre', related_name='games', blank=True)
+    # Weighted title/developer/description vector, filled by a database trigger
+    # and GIN indexed on PostgreSQL (see games.fulltext); unused on SQLite
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    def __str__(self):
+        # This method controls how the object is displayed in the admin and shell.
+        return self.title
+
+
+# GameDetail holds the large HTML columns of a Game (the full description and
+# system requirements). They live in their own table so list queries over
+# games never read them; only the detail page joins it in.
+# The HTML is stored sanitized and ready to display (see games.richtext).
+class GameDetail(models.Model):
+    game = models.OneToOneField(
+        Game,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='detail',
+    )
+    long_description = models.TextField(blank=True)
     # System requirements (minimum)
     pc_requirements_minimum = models.TextField(blank=True)
     mac_requirements_minimum = models.TextField(blank=True)
     linux_requirements_minimum = models.TextField(blank=True)
+    # Plain-text start of long_description
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+
+    HTML_FIELDS = (
+        'long_description',
+        'pc_requirements_minimum',
+        'mac_requirements_minimum',
+        'linux_requirements_minimum',
+    )
 
     def __str__(self):
-        # This method controls how the object is displayed in the admin and shell.
-        return self.title
+        return f"Details of {self.game_id}"
+
+    def render_html(self):
+        """
+        Render raw Steam values into display HTML and refresh the excerpt.
+        Only for raw input (set_game_detail, ingestion): plain-text
+        requirements would be escaped again on every call.
+        """
+        self.long_description = sanitize_html(self.long_description)
+        self.pc_requirements_minimum = render_requirements(self.pc_requirements_minimum)
+        self.mac_requirements_minimum = render_requirements(self.mac_requirements_minimum)
+        self.linux_requirements_minimum = render_requirements(self.linux_requirements_minimum)
+        self.excerpt = html_excerpt(self.long_description)
+
+    def sanitize(self):
+        """
+        Re-sanitize the stored HTML (e.g. after an admin edit) and refresh
+        the excerpt. Unlike render_html() this is safe to repeat.
+        """
+        for field in self.HTML_FIELDS:
+            setattr(self, field, sanitize_html(getattr(self, field)))
+        self.excerpt = html_excerpt(self.long_description)
+
+    def save(self, *args, sanitize=True, **kwargs):
+        # sanitize=False when render_html() has just processed the values
+        if sanitize:
+            self.sanitize()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'excerpt'}
+        super().save(*args, **kwargs)
 
 
 # Tag model represents a tag/category for games.
@@ -54,6 +146,51 @@ class Genre(models.Model):
         return self.genre
 
 
+# SteamApp is the local copy of Steam's GetAppList catalog (appid + name only).
+# It is filled by `manage.py sync_steam_catalog` and backs the search index.
+class SteamApp(models.Model):
+    appid = models.PositiveIntegerField(primary_key=True)
+    name = models.TextField()
+    # Lowercased/accent-stripped name used for matching (see games.catalog)
+    normalized_name = models.CharField(max_length=255, db_index=True)
+    first_seen = models.DateTimeField()
+    # Last sync that added or renamed the app; unchanged apps aren't rewritten
+    last_changed = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} ({self.appid})"
+
+
+# SteamCatalogSync records each sync run and how much of the catalog it changed.
+# The id of the latest run that changed anything is the catalog version.
+class SteamCatalogSync(models.Model):
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    added = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    removed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return (
+            f"Sync {self.started_at:%Y-%m-%d %H:%M}: "
+            f"+{self.added} ~{self.updated} -{self.removed}"
+        )
+
+
+# SteamPayload archives the raw appdetails `data` of every ingested game, so
+# fields can be re-derived later without refetching (see games.archive).
+class SteamPayload(models.Model):
+    appid = models.PositiveIntegerField(primary_key=True)
+    # zlib-compressed canonical JSON
+    data = models.BinaryField()
+    # sha256 of the canonical JSON
+    content_hash = models.CharField(max_length=64)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Payload {self.appid} ({self.fetched_at:%Y-%m-%d})"
+
+
 # Helper function to map Steam API data to Game model fields.
 def map_steam_to_game(info, user=None):
     """
@@ -61,6 +198,7 @@ def map_steam_to_game(info, user=None):
     info: dict from Steam appdetails API
     user: User instance for submitted_by
     Returns: dict suitable for Game.objects.create(**fields)
+    (the GameDetail columns come from map_steam_to_game_detail)
 
     Mapping according to Steam API structure:
     title > name
@@ -69,7 +207,7 @@ def map_steam_to_game(info, user=None):
     release_date > release_date.date
     developer > developers (array, joined)
     age_rating > ratings.usk
-    platform > platforms (object, extract true values)
+    platforms > platforms (object, bitmask of true values)
     """
     # Handle release_date parsing - could be a string
     release_date = None
@@ -87,12 +225,12 @@ def map_steam_to_game(info, user=None):
             except (ValueError, TypeError):
                 pass  # Keep as None if parsing fails
 
-    # Handle platforms - extract platform names where value is True
-    platforms = []
-    if info.get('platforms'):
-        for platform, available in info.get('platforms', {}).items():
-            if available:
-                platforms.append(platform.capitalize())
+    # Handle platforms - combine the bits of platforms where value is True
+    platforms = 0
+    if isinstance(info.get('platforms'), dict):
+        platforms = platform_mask(
+            platform for platform, available in info['platforms'].items() if available
+        )
 
     # Handle age rating safely
     age_rating = None
@@ -104,7 +242,6 @@ def map_steam_to_game(info, user=None):
 
     steam_appid = info.get('steam_appid')
     developer_names = ', '.join(info.get('developers', []))
-    platform_list = ', '.join(platforms)
 
     return {
         # Include steam appid as game_id when present so we can create DB records with Steam PK
@@ -113,14 +250,47 @@ def map_steam_to_game(info, user=None):
         'title': info.get('name', ''),
         'image': info.get('header_image', ''),
         'short_description': info.get('short_description', ''),
-        'long_description': info.get('detailed_description', ''),
         'release_date': release_date,
         'developer': developer_names,
         'age_rating': age_rating,
-        'platform': platform_list,
+        'platforms': platforms,
     }
 
 
+# Helper function to map Steam API data to GameDetail model fields.
+def map_steam_to_game_detail(info):
+    """
+    Map Steam API data to GameDetail model fields (without the game).
+    Values are raw Steam HTML; GameDetail.render_html() processes them once.
+
+    long_description > detailed_description
+    pc/mac/linux_requirements_minimum > pc/mac/linux_requirements.minimum
+    """
+    return {
+        'long_description': info.get('detailed_description', ''),
+        'pc_requirements_minimum': minimum_requirements(info, 'pc_requirements'),
+        'mac_requirements_minimum': minimum_requirements(info, 'mac_requirements'),
+        'linux_requirements_minimum': minimum_requirements(info, 'linux_requirements'),
+    }
+
+
+def minimum_requirements(info, key):
+    """The `minimum` requirements of a Steam *_requirements value, or ''"""
+    # Steam sends an empty list instead of an object when there are none
+    requirements = info.get(key)
+    if isinstance(requirements, dict):
+        return requirements.get('minimum', '')
+    return ''
+
+
+# Helper function to store the GameDetail row of a Game from Steam API data.
+def set_game_detail(game, info):
+    """Create or update the GameDetail of a Game instance from Steam API info"""
+    detail = GameDetail(game=game, **map_steam_to_game_detail(info))
+    detail.render_html()
+    detail.save(sanitize=False)
+
+
 # Helper function to set genres and tags on a Game object from Steam API data.
 def set_game_genres_and_tags(game, info):
     """
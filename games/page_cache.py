@@ -0,0 +1,35 @@
+"""
+Cache of assembled game_list pages (merged DB + Steam cards, facet counts
+and pagination metadata), keyed by the canonical form of the filters.
+Keys embed the DB catalog generation and the Steam catalog version, so
+any Game, Genre or Tag write or catalog sync retires them.
+"""
+import hashlib
+import json
+
+from games.catalog import get_catalog_version
+from games.generations import get_catalog_generation
+
+# Steam cards inside a page are snapshots of appdetails; keep them recent
+PAGE_CACHE_TTL = 600
+
+
+def canonical_filters(search, platform, genres, tags, page):
+    """Filters in a canonical form: equivalent requests compare equal"""
+    return {
+        'search': ' '.join(search.lower().split()),
+        'platform': platform.strip().lower(),
+        'genres': sorted(set(genres)),
+        'tags': sorted(set(tags)),
+        'page': page,
+    }
+
+
+def page_cache_key(filters):
+    """
+    Cache key for canonical filters under the current data versions.
+    Take it before building the page, so a page built while the data
+    changed is stored under the already retired key.
+    """
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode('utf-8')).hexdigest()
+    return 'game_list_page_{}_{}_{}'.format(get_catalog_generation(), get_catalog_version(), digest)
@@ -0,0 +1,54 @@
+"""
+Keyset cursors for the infinite-scroll API.
+A cursor records where the previous page stopped: the sort key of the
+last DB game, or the position in the Steam candidate list once the DB
+games are exhausted. Cursors are signed so clients can't forge positions.
+"""
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'games.pagination'
+
+DB = 'db'
+STEAM = 'steam'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(phase, after=None, position=0):
+    """Opaque cursor for a page starting after `after` (DB) or at `position` (Steam)"""
+    return signing.dumps({'phase': phase, 'after': after, 'position': position}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """Return (phase, after, position) for a cursor from encode_cursor()"""
+    try:
+        state = signing.loads(cursor, salt=CURSOR_SALT)
+        phase, after, position = state['phase'], state['after'], int(state['position'])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise InvalidCursor(cursor)
+    if phase not in (DB, STEAM):
+        raise InvalidCursor(cursor)
+    return phase, after, position
+
+
+def sort_key(game, ranked):
+    """Keyset sort key of a Game: [game_id], or [search_rank, game_id] when ranked"""
+    if ranked:
+        return [game.search_rank, game.game_id]
+    return [game.game_id]
+
+
+def after_key(queryset, after, ranked):
+    """
+    Restrict queryset to rows after the sort key `after`. The queryset must
+    be ordered by game_id, or by (-search_rank, game_id) when ranked.
+    """
+    if after is None:
+        return queryset
+    if ranked:
+        rank, game_id = after
+        return queryset.filter(Q(search_rank__lt=rank) | Q(search_rank=rank, game_id__gt=game_id))
+    return queryset.filter(game_id__gt=after[0])
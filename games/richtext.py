@@ -0,0 +1,166 @@
+"""
+Processing of the HTML fragments Steam sends in appdetails
+(detailed_description and the system requirements).
+Fragments are sanitized against an allowlist, images are made lazy, and
+plain-text requirements are pre-rendered. DB games store the result
+(GameDetail.render_html), so templates output it as is; the cached and
+archived appdetails keep Steam's original HTML. sanitize_html() is
+idempotent; render_requirements() is not for plain text (it escapes it),
+so it must only see raw values.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+
+ALLOWED_TAGS = {
+    'a', 'b', 'br', 'blockquote', 'code', 'div', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'span',
+    'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th', 'thead', 'tr',
+    'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+# Attributes added to every kept tag of that name
+FORCED_ATTRIBUTES = {
+    'a': {'rel': 'nofollow noopener noreferrer', 'target': '_blank'},
+    'img': {'loading': 'lazy', 'decoding': 'async'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = ('http://', 'https://')
+# Tags whose content is dropped along with the tag
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'}
+# Tags after which the excerpt needs a space
+BLOCK_TAGS = {
+    'blockquote', 'br', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr',
+    'li', 'p', 'pre', 'td', 'th', 'tr',
+}
+
+EXCERPT_LENGTH = 300
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_COMMA_RE = re.compile(r',\s*')
+
+
+def _safe_url(value):
+    value = value.strip()
+    if value.startswith('//'):
+        value = 'https:' + value
+    return value if value.lower().startswith(ALLOWED_SCHEMES) else None
+
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds a fragment from allowed tags and attributes; text is re-escaped"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.text = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+        kept = {}
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            kept[name] = value
+        if tag == 'img' and 'src' not in kept:
+            return
+        kept.update(FORCED_ATTRIBUTES.get(tag, {}))
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in kept.items())
+        self.out.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in self.open_tags:
+            return
+        # Close anything left open inside it so the output stays balanced
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        self.out.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.out.append(f'</{self.open_tags.pop()}>')
+
+
+def _parse(value):
+    parser = _Sanitizer()
+    parser.feed(value or '')
+    parser.close()
+    return parser
+
+
+def sanitize_html(value):
+    """Allowlisted HTML for a Steam fragment, with lazy-loading images"""
+    if not value:
+        return ''
+    return ''.join(_parse(value).out).strip()
+
+
+def html_excerpt(value, length=EXCERPT_LENGTH):
+    """Plain-text excerpt of an HTML fragment, cut at a word boundary"""
+    if not value:
+        return ''
+    text = _WHITESPACE_RE.sub(' ', ''.join(_parse(value).text)).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
+
+def render_requirements(value):
+    """
+    Display HTML for a requirements value: Steam HTML is sanitized, plain
+    text is escaped and broken after each comma. Raw values only: plain
+    text is escaped again on every call.
+    """
+    if not value:
+        return ''
+    if '<' in value:
+        return sanitize_html(value)
+    return _COMMA_RE.sub(',<br>', escape(value.strip(), quote=False))
+
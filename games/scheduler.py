@@ -0,0 +1,70 @@
+"""
+Process-wide scheduler for Steam appdetails fetches.
+One long-lived thread pool per process caps concurrent Steam calls no
+matter how many requests are being served at once.
+"""
+import collections
+import concurrent.futures
+import os
+import threading
+
+# Upper bound on Steam fetches running at once in this process
+MAX_CONCURRENT_FETCHES = int(os.environ.get('STEAM_FETCH_CONCURRENCY', '16'))
+# Fetches a single caller may have queued or running at any time.
+# Two list-page batches: the one being filtered and the next one.
+DEFAULT_WINDOW = 60
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return this process's shared fetch pool (recreated after a fork)"""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_FETCHES,
+                    thread_name_prefix='steam-fetch',
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def fetch_stream(fetch, items, window=DEFAULT_WINDOW):
+    """
+    Yield fetch(item) for each item, in input order.
+
+    Keeps up to `window` fetches in flight so the next results are already
+    loading while the caller filters the current ones. Closing the
+    generator (e.g. breaking out of the loop once a page is full) cancels
+    every fetch that has not started yet. Failed fetches yield None.
+    """
+    executor = get_executor()
+    items = iter(items)
+    pending = collections.deque()
+
+    def fill():
+        while len(pending) < window:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending.append(executor.submit(fetch, item))
+
+    try:
+        fill()
+        while pending:
+            future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            fill()
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
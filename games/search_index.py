@@ -0,0 +1,520 @@
+"""
+Search index over the local Steam catalog (SteamApp table).
+Used by the search suggestions API and the game list Steam fallback.
+
+The index is plain NumPy arrays plus NUL-separated UTF-8 blobs. For the
+catalog it is written once per catalog version as an on-disk snapshot and
+memory-mapped read-only, so every worker on a machine shares one physical
+copy and nothing is unpickled or rebuilt per worker or per search.
+"""
+import bisect
+import hashlib
+import logging
+import math
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from games.catalog import get_catalog_version, iter_catalog_apps, normalize_name
+from games.generations import UNSHARED_MAX_AGE, get_generation
+from games.models import Game, SteamCatalogSync
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+# Word offsets are packed into the low bits of the word-start entries
+_OFFSET_BITS = 10
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+# Relevance tiers, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+# Fuzzy matching: share of the query's trigrams a name must contain, and
+# the most posting entries counted per query (the most common trigrams are
+# skipped first), which bounds the cost of a lookup
+FUZZY_MIN_SIMILARITY = 0.5
+FUZZY_SCAN_BUDGET = 250000
+
+# Where catalog snapshots are written; must be local to the machine
+SNAPSHOT_DIR = os.environ.get('STEAM_INDEX_DIR') or os.path.join(tempfile.gettempdir(), 'steam-app-index')
+
+_SEPARATOR = b'\x00'
+_ARRAYS = (
+    'appids', 'by_appid', 'name_offsets', 'norm_offsets', 'prefix_docs',
+    'word_entries', 'gram_offsets', 'posting_offsets', 'posting_docs',
+)
+_BLOBS = ('names', 'norms', 'grams')
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _upper_bound(prefix):
+    """Smallest string that sorts after every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _pack_strings(strings):
+    """One NUL-separated UTF-8 blob plus start offsets (n + 1 entries)"""
+    encoded = [string.encode('utf-8') + _SEPARATOR for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return b''.join(encoded), offsets
+
+
+class StringTable:
+    """Read-only sequence of strings stored in one NUL-separated blob"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i):
+        """UTF-8 bytes of string i, without decoding"""
+        return self.blob[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def __getitem__(self, i):
+        return self.raw(i).decode('utf-8')
+
+
+class AppList:
+    """The catalog as {'appid', 'name'} dicts in appid order, made on access"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        doc = int(self.index.by_appid[i])
+        return {'appid': int(self.index.appids[doc]), 'name': self.index.names[doc]}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SteamAppIndex:
+    """
+    Prebuilt index for ranked substring search over Steam app names.
+
+    Documents are numbered in relevance order (shorter names first, then
+    alphabetical), so within a tier the lowest doc ids are the best hits and
+    every posting list is already sorted by rank.
+
+    - Exact names and name prefixes are range scans over the docs in
+      lexical order (a flattened prefix trie that answers the same range
+      queries in far less memory than a node-per-character trie).
+    - Word prefixes are range scans over packed (doc, word offset) entries.
+    - Substrings are answered from a trigram posting index (CSR arrays)
+      and verified against the normalized name.
+
+    Use build() for an in-memory index and save()/open() for snapshots.
+    """
+
+    def __init__(self, arrays, blobs, version=None):
+        self.version = version
+        self.appids = arrays['appids']
+        self.by_appid = arrays['by_appid']
+        self.names = StringTable(blobs['names'], arrays['name_offsets'])
+        self.norms = StringTable(blobs['norms'], arrays['norm_offsets'])
+        self._prefix_docs = arrays['prefix_docs']
+        self._word_entries = arrays['word_entries']
+        self._posting_offsets = arrays['posting_offsets']
+        self._posting_docs = arrays['posting_docs']
+        grams = StringTable(blobs['grams'], arrays['gram_offsets'])
+        self._grams = {grams[i]: i for i in range(len(grams))}
+        self._arrays = arrays
+        self._blobs = blobs
+        # The whole catalog, for callers that list it rather than search it
+        self.apps = AppList(self)
+
+    @classmethod
+    def build(cls, apps, version=None):
+        """Build an in-memory index from {'appid', 'name'[, 'normalized_name']} dicts"""
+        rows = []
+        for app in apps:
+            name = app.get('name') or ''
+            norm = app.get('normalized_name') or normalize_name(name)
+            appid = app.get('appid')
+            if not norm or appid is None:
+                continue
+            rows.append((len(norm), norm, int(appid), name))
+        rows.sort()
+        norms = [row[1] for row in rows]
+
+        arrays = {'appids': np.array([row[2] for row in rows], dtype=np.int64)}
+        arrays['by_appid'] = np.argsort(arrays['appids'], kind='stable').astype(np.int32)
+        names_blob, arrays['name_offsets'] = _pack_strings(row[3] for row in rows)
+        norms_blob, arrays['norm_offsets'] = _pack_strings(norms)
+
+        # Whole-name prefixes: docs with their normalized names in lexical order
+        arrays['prefix_docs'] = np.array(sorted(range(len(norms)), key=norms.__getitem__), dtype=np.int32)
+
+        # Word prefixes: (doc, offset) of every word after the first one
+        entries = []
+        for doc, norm in enumerate(norms):
+            offset = norm.find(' ')
+            while offset != -1 and offset + 1 <= _OFFSET_MASK:
+                entries.append((doc << _OFFSET_BITS) | (offset + 1))
+                offset = norm.find(' ', offset + 1)
+        entries.sort(key=lambda entry: norms[entry >> _OFFSET_BITS][entry & _OFFSET_MASK:])
+        arrays['word_entries'] = np.array(entries, dtype=np.int64)
+
+        # Trigram postings, filled in doc order so each list stays sorted
+        postings = defaultdict(list)
+        for doc, norm in enumerate(norms):
+            for gram in _ngrams(norm):
+                postings[gram].append(doc)
+        grams = sorted(postings)
+        grams_blob, arrays['gram_offsets'] = _pack_strings(grams)
+        arrays['posting_offsets'] = np.zeros(len(grams) + 1, dtype=np.int64)
+        if grams:
+            np.cumsum([len(postings[gram]) for gram in grams], out=arrays['posting_offsets'][1:])
+        arrays['posting_docs'] = np.fromiter(
+            (doc for gram in grams for doc in postings[gram]),
+            dtype=np.int32,
+            count=int(arrays['posting_offsets'][-1]),
+        )
+
+        blobs = {'names': names_blob, 'norms': norms_blob, 'grams': grams_blob}
+        return cls(arrays, blobs, version=version)
+
+    def save(self, path):
+        """
+        Write the index as a snapshot directory at path. The directory is
+        written under a temporary name and renamed into place, so readers
+        never see a partial snapshot; if another process got there first
+        its snapshot is kept.
+        """
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(tmp, f'{name}.npy'), np.asarray(self._arrays[name]))
+            for name in _BLOBS:
+                with open(os.path.join(tmp, f'{name}.bin'), 'wb') as fh:
+                    fh.write(self._blobs[name])
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+
+    @classmethod
+    def open(cls, path, version=None):
+        """Memory-map a snapshot written by save(), read-only"""
+        # Plain ndarray views of the maps skip np.memmap's per-item overhead
+        arrays = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r').view(np.ndarray)
+            for name in _ARRAYS
+        }
+        blobs = {name: _map_file(os.path.join(path, f'{name}.bin')) for name in _BLOBS}
+        return cls(arrays, blobs, version=version)
+
+    def __len__(self):
+        return len(self.appids)
+
+    def _norm_key(self, doc):
+        return self.norms[doc]
+
+    def _word_key(self, entry):
+        return self.norms[int(entry) >> _OFFSET_BITS][int(entry) & _OFFSET_MASK:]
+
+    def _prefix_range(self, query):
+        docs = self._prefix_docs
+        lo = bisect.bisect_left(docs, query, key=self._norm_key)
+        hi = bisect.bisect_left(docs, _upper_bound(query), lo, key=self._norm_key)
+        return docs[lo:hi]
+
+    def _exact_doc(self, query):
+        docs = self._prefix_docs
+        lo = bisect.bisect_left(docs, query, key=self._norm_key)
+        # Equal names keep doc order, so the first one is the best ranked
+        if lo < len(docs) and self.norms[docs[lo]] == query:
+            return int(docs[lo])
+        return None
+
+    def _word_prefix_range(self, query):
+        entries = self._word_entries
+        lo = bisect.bisect_left(entries, query, key=self._word_key)
+        hi = bisect.bisect_left(entries, _upper_bound(query), lo, key=self._word_key)
+        return np.unique(np.asarray(entries[lo:hi]) >> _OFFSET_BITS)
+
+    def _posting(self, gram):
+        i = self._grams.get(gram)
+        if i is None:
+            return None
+        return self._posting_docs[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+    def _substring_docs(self, query):
+        """Yield docs containing query, best ranked first"""
+        needle = query.encode('utf-8')
+        if len(query) < NGRAM_SIZE:
+            # Too short for trigrams; match against the whole names blob at
+            # once. The NUL separators keep matches from spanning two names.
+            blob = np.frombuffer(self.norms.blob, dtype=np.uint8)
+            span = len(blob) - len(needle) + 1
+            if span <= 0:
+                return
+            hits = blob[:span] == needle[0]
+            for i in range(1, len(needle)):
+                hits &= blob[i:i + span] == needle[i]
+            starts = np.flatnonzero(hits)
+            yield from np.unique(np.searchsorted(self.norms.offsets, starts, side='right') - 1).tolist()
+            return
+        lists = []
+        for gram in _ngrams(query):
+            posting = self._posting(gram)
+            if posting is None or not len(posting):
+                return
+            lists.append(posting)
+        lists.sort(key=len)
+        raw = self.norms.raw
+        for doc in lists[0].tolist():
+            # Byte containment matches str containment for UTF-8
+            if needle in raw(doc):
+                yield doc
+
+    def search_docs(self, query, limit=None):
+        """Return doc ids matching query, ranked by (tier, doc)"""
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        if limit is None:
+            docs = np.fromiter(self._substring_docs(query), dtype=np.int64)
+            # Tier every match with the range scans rather than per name
+            tiers = np.full(len(docs), SUBSTRING)
+            tiers[np.isin(docs, self._word_prefix_range(query))] = WORD_PREFIX
+            prefix = self._prefix_range(query)
+            tiers[np.isin(docs, prefix)] = PREFIX
+            exact = prefix[:bisect.bisect_right(prefix, query, key=self._norm_key)]
+            tiers[np.isin(docs, exact)] = EXACT
+            return docs[np.lexsort((docs, tiers))].tolist()
+
+        results = []
+        seen = set()
+
+        def take(candidates):
+            for doc in candidates:
+                if len(results) >= limit:
+                    return
+                if doc not in seen:
+                    seen.add(doc)
+                    results.append(doc)
+
+        exact = self._exact_doc(query)
+        if exact is not None:
+            take([exact])
+        if len(results) < limit:
+            take(np.sort(self._prefix_range(query))[:limit + len(seen)].tolist())
+        if len(results) < limit:
+            take(self._word_prefix_range(query)[:limit + len(seen)].tolist())
+        if len(results) < limit:
+            take(self._substring_docs(query))
+        return results
+
+    def search(self, query, limit=None):
+        """Return ranked [{'appid', 'name'}] matches for query"""
+        docs = self.search_docs(query, limit)
+        appids = self.appids[docs].tolist() if docs else []
+        return [
+            {'appid': appid, 'name': self.names[doc]}
+            for appid, doc in zip(appids, docs)
+        ]
+
+    def fuzzy_docs(self, query, limit):
+        """
+        Return up to limit (similarity, doc) pairs for names sharing most
+        of the query's trigrams, best first. Tolerates typos and missing
+        spaces or punctuation ("skyrm", "halflife") without comparing the
+        query against every name.
+        """
+        grams = _ngrams(normalize_name(query))
+        if not grams:
+            return []
+        lists = sorted(
+            (posting for posting in map(self._posting, grams) if posting is not None),
+            key=len,
+        )
+        used = []
+        scanned = 0
+        for posting in lists:
+            if scanned + len(posting) > FUZZY_SCAN_BUDGET:
+                break
+            used.append(posting)
+            scanned += len(posting)
+        if not used:
+            return []
+        counts = np.bincount(np.concatenate(used), minlength=len(self))
+        needed = min(len(used), max(1, math.ceil(len(grams) * FUZZY_MIN_SIMILARITY)))
+        docs = np.flatnonzero(counts >= needed)
+        # Most shared trigrams first, then best ranked doc
+        best = docs[np.lexsort((docs, -counts[docs]))[:limit]]
+        return [(int(counts[doc]) / len(grams), int(doc)) for doc in best]
+
+    def fuzzy_search(self, query, limit):
+        """Return ranked [{'appid', 'name'}] fuzzy matches for query"""
+        return [
+            {'appid': int(self.appids[doc]), 'name': self.names[doc]}
+            for _, doc in self.fuzzy_docs(query, limit)
+        ]
+
+
+def _map_file(path):
+    with open(path, 'rb') as fh:
+        if not os.fstat(fh.fileno()).st_size:
+            return b''  # mmap can't map an empty file
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _snapshot_prefix():
+    # Catalog versions are sync row ids, so they are only unique per database
+    database = settings.DATABASES['default']
+    identity = f"{database.get('HOST', '')}/{database.get('NAME', '')}"
+    return 'steam-apps-' + hashlib.sha1(identity.encode('utf-8')).hexdigest()[:12] + '-'
+
+
+def _prune_snapshots(keep):
+    """Delete this database's snapshots other than keep; open maps stay valid"""
+    prefix = _snapshot_prefix()
+    for entry in os.listdir(SNAPSHOT_DIR):
+        path = os.path.join(SNAPSHOT_DIR, entry)
+        if entry.startswith(prefix) and path != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_catalog_index(version):
+    """
+    Memory-map the catalog snapshot for version, writing it first if no
+    process on this machine has yet. If the snapshot can't be written the
+    index is kept in memory instead.
+    """
+    # A recreated database can reuse sync ids, so the sync time is part of the name
+    finished_at = (
+        SteamCatalogSync.objects
+        .filter(pk=version)
+        .values_list('finished_at', flat=True)
+        .first()
+    )
+    stamp = int(finished_at.timestamp() * 1e6) if finished_at else 0
+    path = os.path.join(SNAPSHOT_DIR, f'{_snapshot_prefix()}{version}-{stamp}')
+    if not os.path.isdir(path):
+        index = SteamAppIndex.build(iter_catalog_apps(), version=version)
+        if not len(index):
+            return index
+        try:
+            index.save(path)
+            _prune_snapshots(keep=path)
+        except OSError:
+            # Serve this process from memory rather than fail every search
+            logger.exception('Could not write catalog snapshot %s', path)
+            return index
+    return SteamAppIndex.open(path, version=version)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_app_index():
+    """
+    Return the process-wide SteamAppIndex for the current catalog version.
+    The snapshot is rebuilt from the SteamApp table only after a sync has
+    changed the catalog.
+    """
+    global _index
+    index = _index
+    if index is not None and index.version == get_catalog_version():
+        return index
+    with _index_lock:
+        version = get_catalog_version()
+        index = _index
+        if index is not None and index.version == version:
+            return index
+        index = load_catalog_index(version)
+        _index = index
+    return index
+
+
+# (generation, built_at, index) over DB game titles, swapped as a whole
+_title_state = (None, 0.0, None)
+
+
+def _current_title_index(generation):
+    built_for, built_at, index = _title_state
+    if index is not None and built_for == generation and time.monotonic() - built_at < UNSHARED_MAX_AGE:
+        return index
+    return None
+
+
+def get_title_index():
+    """
+    Return the process-wide SteamAppIndex over DB game titles, rebuilt
+    after Game writes and every UNSHARED_MAX_AGE seconds. Covers games
+    that are not in the Steam catalog.
+    """
+    global _title_state
+    index = _current_title_index(get_generation('games'))
+    if index is not None:
+        return index
+    with _index_lock:
+        # Another thread may have rebuilt it while this one waited
+        generation = get_generation('games')
+        index = _current_title_index(generation)
+        if index is not None:
+            return index
+        apps = [
+            {'appid': game_id, 'name': title}
+            for game_id, title in Game.objects.values_list('game_id', 'title')
+        ]
+        index = SteamAppIndex.build(apps, version=generation)
+        _title_state = (generation, time.monotonic(), index)
+    return index
+
+
+def suggest(query, limit):
+    """
+    Ranked [{'appid', 'name'}] suggestions from the Steam catalog and DB
+    game titles. Direct matches come first; when there are fewer than
+    limit, fuzzy matches from both indexes fill the rest.
+    """
+    indexes = [get_app_index(), get_title_index()]
+    results = []
+    seen = set()
+
+    def take(matches):
+        for match in matches:
+            if len(results) >= limit:
+                return
+            if match['appid'] not in seen:
+                seen.add(match['appid'])
+                results.append(match)
+
+    for index in indexes:
+        take(index.search(query, limit))
+    if len(results) < limit:
+        fuzzy = []
+        for index in indexes:
+            for similarity, doc in index.fuzzy_docs(query, limit):
+                fuzzy.append((-similarity, len(index.norms[doc]), index.names[doc], int(index.appids[doc])))
+        fuzzy.sort()
+        take({'appid': appid, 'name': name} for _, _, name, appid in fuzzy)
+    return results
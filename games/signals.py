@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .generations import bump_generation
+from .models import Game, Genre, Tag
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def bump_games_generation(sender, instance, **kwargs):
+    """Invalidate caches derived from DB games when a Game is written"""
+    bump_generation('games', changed=[instance.pk])
+
+
+@receiver(m2m_changed, sender=Game.genres.through)
+@receiver(m2m_changed, sender=Game.tags.through)
+def bump_games_generation_on_labels(sender, action, instance, reverse, pk_set, **kwargs):
+    """Invalidate caches derived from DB games when a game's genres or tags change"""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        changed = [instance.pk]
+    elif pk_set is not None:
+        changed = pk_set
+    else:
+        # genre.games.clear(): the affected games are not known
+        changed = None
+    bump_generation('games', changed=changed)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_labels_generation(sender, **kwargs):
+    """Invalidate cached pages and filter lists when a Genre or Tag is written"""
+    bump_generation('labels')
@@ -0,0 +1,92 @@
+"""
+Single-flight call coalescing.
+Concurrent callers asking for the same key share one execution: within a
+process through a per-key event, across workers through a lock key in the
+shared cache.
+"""
+import os
+import threading
+import time
+
+from django.core.cache import cache
+
+# Cross-worker lock lifetime; longer than any single fetch including retries
+LOCK_TTL = 30
+# How long a finished result stays available to waiters in other workers
+RESULT_TTL = 30
+# How long a waiter blocks before giving up and running the call itself
+WAIT_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def _run_shared(key, fn):
+    """Run fn at most once across workers sharing the cache"""
+    lock_key = f'singleflight_lock_{key}'
+    result_key = f'singleflight_result_{key}'
+
+    # Results are stored wrapped in a tuple so a None result still counts
+    cached = cache.get(result_key)
+    if cached is not None:
+        return cached[0]
+
+    if cache.add(lock_key, os.getpid(), LOCK_TTL):
+        try:
+            result = fn()
+            cache.set(result_key, (result,), RESULT_TTL)
+            return result
+        finally:
+            cache.delete(lock_key)
+
+    # Another worker is running it: wait for its result
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        cached = cache.get(result_key)
+        if cached is not None:
+            return cached[0]
+        if cache.get(lock_key) is None:
+            # Leader finished without a result (it failed) or died
+            break
+    return fn()
+
+
+def single_flight(key, fn):
+    """
+    Return fn(), sharing one execution among concurrent callers for key.
+    If the shared execution raises, every caller waiting on it gets the
+    same exception.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if not call.event.wait(WAIT_TIMEOUT):
+            return fn()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _run_shared(key, fn)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.event.set()
@@ -0,0 +1,250 @@
+"""
+Cached and coalesced access to Steam appdetails.
+Everything that needs appdetails for an appid goes through here rather
+than calling games.steam_client directly.
+"""
+import json
+import time
+import zlib
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+from games import steam_client
+from games.models import minimum_requirements
+from games.richtext import render_requirements, sanitize_html
+from games.singleflight import single_flight
+from games.swr import schedule_refresh, swr_entry, swr_set
+
+# Raw appdetails payloads, one compressed entry per appid. The list card,
+# detail page and Game field dicts are all derived from it.
+# Entries are fresh for a day, then served stale for up to a week while a
+# background refresh replaces them.
+RAW_CACHE_TTL = 86400  # 24 hours
+RAW_CACHE_GRACE = 7 * 86400
+RAW_COMPRESSION_LEVEL = 6
+
+# Detail page projections, with their HTML already sanitized. Each is
+# tagged with the fetch time of the raw entry it was built from, so a
+# refreshed raw entry makes it stale.
+DETAIL_CACHE_TTL = RAW_CACHE_TTL + RAW_CACHE_GRACE
+
+# (connect, read) timeout for appdetails fetches made while rendering cards
+CARD_FETCH_TIMEOUT = (2, 2)
+
+# Negative cache: appids Steam recently failed on, with why.
+# success=false (DLC, delisted apps, tools) rarely changes, so it is kept
+# for days; transient failures only long enough to stop hammering Steam.
+NOT_FOUND = 'not_found'
+NEGATIVE_CACHE_TTLS = {
+    NOT_FOUND: 7 * 86400,
+    steam_client.TIMEOUT: 600,
+    steam_client.UNAVAILABLE: 300,
+    steam_client.RATE_LIMITED: 120,
+    steam_client.BAD_RESPONSE: 3600,
+}
+# Candidates checked against the negative cache per cache round trip
+NEGATIVE_LOOKUP_CHUNK = 60
+
+
+def _negative_key(appid):
+    return f'steam_negative_{appid}'
+
+
+def record_failure(appid, reason):
+    """Remember that fetching appid failed, for the TTL of its reason"""
+    cache.set(_negative_key(appid), reason, NEGATIVE_CACHE_TTLS.get(reason, 600))
+
+
+def get_failure(appid):
+    """Return the cached failure reason for appid, or None"""
+    return cache.get(_negative_key(appid))
+
+
+def iter_fetchable_appids(appids, chunk_size=NEGATIVE_LOOKUP_CHUNK, key=None):
+    """
+    Yield appids that are not in the negative cache.
+    Lookups are batched per chunk and done lazily, so a caller that stops
+    early only pays for the candidates it actually consumed.
+    key, if given, maps each item to its appid so other items can be
+    filtered the same way.
+    """
+    chunk = []
+    for appid in appids:
+        chunk.append(appid)
+        if len(chunk) >= chunk_size:
+            yield from _drop_known_bad(chunk, key)
+            chunk = []
+    if chunk:
+        yield from _drop_known_bad(chunk, key)
+
+
+def _drop_known_bad(items, key=None):
+    keys = [_negative_key(key(item) if key else item) for item in items]
+    known_bad = cache.get_many(keys)
+    return [item for item, negative_key in zip(items, keys) if negative_key not in known_bad]
+
+
+def fetch_app_details(appid, timeout=None, attempts=None):
+    """
+    Fetch appdetails `data` for appid, with at most one request per appid
+    in flight across threads and workers. Returns None for success=false
+    and for appids already known to be missing on Steam.
+    """
+    if get_failure(appid) == NOT_FOUND:
+        return None
+
+    def fetch():
+        try:
+            info = steam_client.get_app_details(appid, timeout=timeout, attempts=attempts)
+        except steam_client.SteamAPIError as e:
+            # A refusal by the open circuit says nothing about this appid
+            if e.reason != steam_client.CIRCUIT_OPEN:
+                record_failure(appid, e.reason)
+            raise
+        if info is None:
+            record_failure(appid, NOT_FOUND)
+        return info
+
+    return single_flight(f'appdetails_{appid}', fetch)
+
+
+def _raw_key(appid):
+    # v2: entries hold Steam's data unmodified (v1 briefly cached it sanitized)
+    return f'steam_appdetails_raw_v2_{appid}'
+
+
+def _pack(info):
+    return zlib.compress(
+        json.dumps(info, separators=(',', ':')).encode('utf-8'),
+        RAW_COMPRESSION_LEVEL,
+    )
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def _refresh_app_details(appid):
+    info = fetch_app_details(appid)
+    if info:
+        swr_set(_raw_key(appid), _pack(info), RAW_CACHE_TTL, RAW_CACHE_GRACE)
+    else:
+        # Steam no longer has data for this appid
+        cache.delete(_raw_key(appid))
+
+
+def _fetched_at(soft_expires_at):
+    # Entries are stored fresh for RAW_CACHE_TTL from the moment of the fetch
+    return datetime.fromtimestamp(soft_expires_at - RAW_CACHE_TTL, tz=timezone.utc)
+
+
+def get_app_details_entry(appid, timeout=None, attempts=None):
+    """
+    Return (info, fetched_at) for appid: the raw appdetails `data` dict,
+    as for get_app_details(), and when it was fetched from Steam (an
+    aware datetime; a stale entry can be days old).
+    """
+    key = _raw_key(appid)
+    blob, soft_expires_at = swr_entry(key)
+    if blob is not None:
+        try:
+            info = _unpack(blob)
+        except (zlib.error, ValueError):
+            cache.delete(key)
+        else:
+            if time.time() >= soft_expires_at:
+                schedule_refresh(key, lambda: _refresh_app_details(appid))
+            return info, _fetched_at(soft_expires_at)
+
+    info = fetch_app_details(appid, timeout=timeout, attempts=attempts)
+    if not info:
+        return info, None
+    soft_expires_at = swr_set(key, _pack(info), RAW_CACHE_TTL, RAW_CACHE_GRACE)
+    return info, _fetched_at(soft_expires_at)
+
+
+def get_app_details(appid, timeout=None, attempts=None):
+    """
+    Return the raw appdetails `data` dict for appid from the shared
+    compressed cache, fetching it from Steam on a miss.
+    A stale entry is returned immediately and refreshed in the background.
+    Returns None when Steam has no data for the appid. The data is
+    exactly what Steam sent, so it can be archived as is; views clean
+    its HTML when they project it.
+    """
+    return get_app_details_entry(appid, timeout=timeout, attempts=attempts)[0]
+
+
+def minimal_view(info):
+    """Card projection used by the game list views"""
+    genres = info.get('genres', [])
+    categories = info.get('categories', [])
+    return {
+        'appid': info.get('steam_appid'),
+        'title': info.get('name', 'Unknown'),
+        'image': info.get('header_image'),
+        'platforms': info.get('platforms', {}),  # Windows, Mac, Linux
+        'genres': genres[:2] if genres else [],  # Only first 2 genres
+        'tags': categories[:2] if categories else [],  # Only first 2 tags
+    }
+
+
+def detail_view(info):
+    """Full projection used by the game detail page"""
+    # Only the HTML the page shows is processed; DB games store it rendered
+    return {
+        'appid': info.get('steam_appid'),
+        'title': info.get('name', 'Unknown'),
+        'developer': ', '.join(info.get('developers', [])),
+        'publisher': ', '.join(info.get('publishers', [])),
+        'release_date': info.get('release_date', {}).get('date', ''),
+        'image': info.get('header_image'),
+        'short_description': info.get('short_description', ''),
+        'detailed_description': sanitize_html(info.get('detailed_description', '')),
+        'platforms': info.get('platforms', {}),
+        'genres': info.get('genres', []),
+        'tags': info.get('categories', []),
+        'price_overview': info.get('price_overview', {}),
+        'metacritic': info.get('metacritic', {}),
+        'recommendations': info.get('recommendations', {}),
+        # System requirements for PC, Mac, Linux
+        'pc_requirements_minimum': render_requirements(minimum_requirements(info, 'pc_requirements')),
+        'mac_requirements_minimum': render_requirements(minimum_requirements(info, 'mac_requirements')),
+        'linux_requirements_minimum': render_requirements(minimum_requirements(info, 'linux_requirements')),
+    }
+
+
+def get_cached_game_minimal(appid):
+    """Get minimal game data for list view - much faster"""
+    try:
+        # Short read timeout and a single retry: the list page can't wait long
+        info = get_app_details(appid, timeout=CARD_FETCH_TIMEOUT, attempts=2)
+    except Exception:
+        return None
+    return minimal_view(info) if info else None
+
+
+def _detail_key(appid):
+    return f'steam_appdetails_detail_{appid}'
+
+
+def get_cached_game_details(appid):
+    """
+    Get full game details for detail view. The projection is cached next
+    to the raw entry, so its HTML is sanitized once per fetch, not per
+    request.
+    """
+    try:
+        info, fetched_at = get_app_details_entry(appid)
+    except Exception:
+        return None
+    if not info:
+        return None
+    key = _detail_key(appid)
+    cached = cache.get(key)
+    if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == fetched_at:
+        return cached[1]
+    details = detail_view(info)
+    cache.set(key, (fetched_at, details), DETAIL_CACHE_TTL)
+    return details
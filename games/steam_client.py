@@ -0,0 +1,197 @@
+"""
+Shared HTTP client for every outbound Steam call.
+Keeps a pooled keep-alive session per process, applies per-endpoint
+timeouts, retries 429/5xx with jittered backoff and decodes responses.
+Calls go through a shared circuit breaker that refuses them outright
+while Steam is down.
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from games.circuit import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails"
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+
+# (connect, read) timeouts in seconds per endpoint
+TIMEOUTS = {
+    'appdetails': (3.05, 5),
+    'applist': (3.05, 30),
+}
+# Attempts per endpoint, including the first one
+MAX_ATTEMPTS = {
+    'appdetails': 3,
+    'applist': 3,
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_MAX = 8  # seconds
+
+# Connections kept alive per host; sized for the fetch thread pools
+POOL_MAXSIZE = 32
+
+USER_AGENT = 'Backlog-Wishlyst/1.0'
+
+
+# Failure reasons carried by SteamAPIError
+TIMEOUT = 'timeout'
+RATE_LIMITED = 'rate_limited'
+UNAVAILABLE = 'unavailable'
+BAD_RESPONSE = 'bad_response'
+# Refused without a request because the circuit breaker is open
+CIRCUIT_OPEN = 'circuit_open'
+
+# Failures that count as Steam being down
+OUTAGE_REASONS = {TIMEOUT, UNAVAILABLE}
+
+# Cheap, always-present app fetched to check whether Steam is back
+PROBE_APPID = 10
+
+
+class SteamAPIError(Exception):
+    """Steam could not be reached or returned an unusable response"""
+
+    def __init__(self, message, status=None, reason=BAD_RESPONSE):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+def _status_reason(status):
+    if status == 429:
+        return RATE_LIMITED
+    if status >= 500:
+        return UNAVAILABLE
+    return BAD_RESPONSE
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return this process's pooled session (recreated after a fork)"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+                _session = session
+                _session_pid = pid
+    return _session
+
+
+def _backoff_delay(attempt, response=None):
+    """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(int(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def get_json(url, endpoint, params=None, timeout=None, attempts=None):
+    """
+    GET url and return the decoded JSON body.
+    Retries connection errors, timeouts, 429 and 5xx; raises SteamAPIError
+    once the attempts for this endpoint are used up, or straight away while
+    the circuit breaker is open.
+    """
+    if not breaker.allow():
+        raise SteamAPIError('Live Steam data is temporarily unavailable', reason=CIRCUIT_OPEN)
+    try:
+        data = _get_json(url, endpoint, params=params, timeout=timeout, attempts=attempts)
+    except SteamAPIError as e:
+        if e.reason in OUTAGE_REASONS:
+            breaker.record_failure()
+        raise
+    breaker.record_success()
+    return data
+
+
+def _get_json(url, endpoint, params=None, timeout=None, attempts=None):
+    timeout = timeout or TIMEOUTS[endpoint]
+    attempts = attempts or MAX_ATTEMPTS[endpoint]
+    session = get_session()
+
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # No point retrying once other calls have tripped the breaker
+            if last or breaker.is_open():
+                reason = TIMEOUT if isinstance(e, requests.Timeout) else UNAVAILABLE
+                raise SteamAPIError(f"{endpoint} request failed: {e}", reason=reason) from e
+            time.sleep(_backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUSES and not last:
+            logger.info('Steam %s returned %s, retrying', endpoint, response.status_code)
+            time.sleep(_backoff_delay(attempt, response))
+            continue
+        if response.status_code != 200:
+            raise SteamAPIError(
+                f"{endpoint} returned HTTP {response.status_code}",
+                status=response.status_code,
+                reason=_status_reason(response.status_code),
+            )
+        try:
+            return response.json()
+        except ValueError as e:
+            raise SteamAPIError(f"{endpoint} returned invalid JSON") from e
+
+
+def _probe():
+    # Bypasses the breaker; a single quick attempt
+    _get_json(
+        APP_DETAILS_URL, 'appdetails', params={'appids': PROBE_APPID},
+        timeout=TIMEOUTS['appdetails'], attempts=1,
+    )
+
+
+breaker = CircuitBreaker('steam', _probe)
+
+
+def steam_unavailable():
+    """True while the circuit is open and only cached Steam data is served"""
+    return breaker.is_open()
+
+
+def get_app_details(appid, timeout=None, attempts=None):
+    """
+    Return the appdetails `data` dict for appid.
+    Returns None when Steam answers success=false (DLC, delisted, ...).
+    """
+    data = get_json(
+        APP_DETAILS_URL, 'appdetails', params={'appids': appid},
+        timeout=timeout, attempts=attempts,
+    )
+    if not isinstance(data, dict):
+        raise SteamAPIError('appdetails returned an unexpected payload')
+    app_data = data.get(str(appid)) or {}
+    if not app_data.get('success'):
+        return None
+    return app_data.get('data') or None
+
+
+def get_app_list(url=APP_LIST_URL, timeout=None):
+    """Return the apps array from GetAppList"""
+    data = get_json(url, 'applist', timeout=timeout)
+    if isinstance(data, dict):
+        return data.get('applist', {}).get('apps', [])
+    return data or []
@@ -0,0 +1,66 @@
+"""
+Stale-while-revalidate cache entries.
+Entries carry a soft expiry inside the cached value and a much longer hard
+TTL in the cache itself. Past the soft expiry the stale value is still
+served while a single background refresh replaces it.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+
+from games.scheduler import get_executor
+
+logger = logging.getLogger(__name__)
+
+# How long one worker owns a refresh before another may retry it
+REFRESH_LOCK_TTL = 60
+
+
+def swr_set(key, value, soft_ttl, grace):
+    """
+    Store value as fresh for soft_ttl seconds, servable for grace more.
+    Returns the soft expiry timestamp.
+    """
+    soft_expires_at = time.time() + soft_ttl
+    cache.set(key, (soft_expires_at, value), soft_ttl + grace)
+    return soft_expires_at
+
+
+def swr_entry(key):
+    """Return (value, soft expiry timestamp) for key; (None, None) on a miss"""
+    entry = cache.get(key)
+    if not isinstance(entry, tuple) or len(entry) != 2:
+        return None, None
+    soft_expires_at, value = entry
+    return value, soft_expires_at
+
+
+def swr_get(key):
+    """Return (value, fresh) for key; (None, False) on a miss"""
+    value, soft_expires_at = swr_entry(key)
+    if soft_expires_at is None:
+        return None, False
+    return value, time.time() < soft_expires_at
+
+
+def schedule_refresh(key, refresh):
+    """
+    Run refresh() on the shared fetch pool unless a refresh for key is
+    already running in this or another worker. Returns True if scheduled.
+    """
+    lock_key = f'{key}:refreshing'
+    if not cache.add(lock_key, 1, REFRESH_LOCK_TTL):
+        return False
+
+    def run():
+        try:
+            refresh()
+        except Exception:
+            # The stale value stays in place until the hard expiry
+            logger.warning('Background refresh of %s failed', key, exc_info=True)
+        finally:
+            cache.delete(lock_key)
+
+    get_executor().submit(run)
+    return True
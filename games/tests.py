@@ -0,0 +1,115 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from games.ingest import ingest_payloads
+from games.models import Game, GameDetail, map_steam_to_game, set_game_detail
+from games.page_cache import canonical_filters, page_cache_key
+
+GAMES = 12
+
+
+def appdetails(appid):
+    """Minimal appdetails data for a game with two genres and two categories"""
+    return {
+        'steam_appid': appid,
+        'name': f'Game {appid}',
+        'short_description': f'Short description {appid}',
+        'detailed_description': f'<p>Long description {appid}</p>',
+        'platforms': {'windows': True, 'mac': appid % 2 == 0, 'linux': False},
+        'genres': [
+            {'id': str(appid % 3 + 1), 'description': f'Genre {appid % 3 + 1}'},
+            {'id': '10', 'description': 'Indie'},
+        ],
+        'categories': [
+            {'id': appid % 4 + 1, 'description': f'Category {appid % 4 + 1}'},
+            {'id': 20, 'description': 'Single-player'},
+        ],
+    }
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Queries per view over a page of several games. Genres and tags are
+    loaded once per page, so the counts don't grow with the page size;
+    a per-game genres.all()/tags.all() makes these fail.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('budget', password='x')
+        ingest_payloads([appdetails(appid) for appid in range(1, GAMES + 1)], cls.user)
+
+    def setUp(self):
+        # Warm the per-process indexes and the label lists, which are
+        # rebuilt only when the data changes, not per request
+        self.client.get(reverse('game_list'))
+        self.client.get(reverse('game_list_api'))
+
+    def test_game_list(self):
+        # Assembled pages are cached; measure building one
+        cache.delete(page_cache_key(canonical_filters('', '', [], [], 1)))
+        # COUNT, card rows, genres, tags
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('game_list'))
+        self.assertEqual(len(response.context['games']), GAMES)
+
+    def test_game_list_filtered(self):
+        cache.delete(page_cache_key(canonical_filters('', 'mac', ['10'], [], 1)))
+        # Card rows, genres, tags (matches come from the facet index)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('game_list'), {'platform': 'mac', 'genres': '10'})
+        self.assertEqual(len(response.context['games']), GAMES // 2)
+
+    def test_game_list_search_as_typed(self):
+        response = self.client.get(reverse('game_list'), {'search': '  Game 1 '})
+        self.assertEqual(response.context['search_query'], 'Game 1')
+        self.assertIn('Game 1', [game['title'] for game in response.context['games']])
+
+    def test_game_list_api(self):
+        # Card rows (one past the page), genres, tags
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('game_list_api'), {'page': 1})
+        games = response.json()['games']
+        self.assertEqual(len(games), GAMES)
+        self.assertTrue(all(game['genres'] and game['tags'] for game in games))
+
+    def test_game_detail(self):
+        # Game joined with its GameDetail, genres, tags
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('game_detail', args=[1]))
+        self.assertEqual(response.context['game']['title'], 'Game 1')
+        self.assertEqual(len(response.context['game']['genres']), 2)
+
+
+class GameDetailHtmlTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('detail', password='x')
+
+    def test_save_is_idempotent(self):
+        info = appdetails(1)
+        info['pc_requirements'] = {'minimum': 'Windows 10 & 11 "64-bit", 8 GB RAM'}
+        ingest_payloads([info], self.user)
+        detail = GameDetail.objects.get(game_id=1)
+        rendered = detail.pc_requirements_minimum
+        self.assertEqual(rendered, 'Windows 10 &amp; 11 "64-bit",<br>8 GB RAM')
+        # Admin saves re-sanitize what is stored without escaping it again
+        for _ in range(2):
+            detail.save()
+            detail.refresh_from_db()
+            self.assertEqual(detail.pc_requirements_minimum, rendered)
+            self.assertEqual(detail.long_description, '<p>Long description 1</p>')
+
+    def test_set_game_detail(self):
+        info = appdetails(2)
+        info['mac_requirements'] = {'minimum': 'macOS 12 & later'}
+        game = Game.objects.create(**map_steam_to_game(info, user=self.user))
+        set_game_detail(game, info)
+        set_game_detail(game, info)
+        detail = GameDetail.objects.get(game=game)
+        self.assertEqual(detail.mac_requirements_minimum, 'macOS 12 &amp; later')
+        detail.save()
+        detail.refresh_from_db()
+        self.assertEqual(detail.mac_requirements_minimum, 'macOS 12 &amp; later')
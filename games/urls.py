@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('', views.game_list, name='game_list'),
     path('api/load-more/', views.game_list_api, name='game_list_api'),
+    path('api/page-fill/', views.game_list_fill_api, name='game_list_fill_api'),
     path(
         'api/search-suggestions/',
         views.search_suggestions_api,
@@ -2,128 +2,57 @@
 Views for Steam game browsing, details, and wishlist management.
 Handles fetching Steam data, filtering, and rendering templates.
 """
-import requests
-import concurrent.futures
+import json
 import logging
+from itertools import islice
+from operator import itemgetter
 from django.core.cache import cache
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from games.models import (
-    Genre,
-    Tag,
     Game,
     map_steam_to_game,
+    platform_filter,
+    set_game_detail,
     set_game_genres_and_tags,
 )
+from games.archive import archive_payload
+from games.cards import CARD_PREFETCH, card_queryset, game_cards, game_cards_by_id, game_detail_dict
+from games.facets import get_facet_index
+from games.fulltext import search_games
+from games.labels import genre_choices, tag_choices
+from games.membership import get_db_appids
+from games.page_cache import PAGE_CACHE_TTL, canonical_filters, page_cache_key
+from games.pagination import DB, STEAM, InvalidCursor, after_key, decode_cursor, encode_cursor, sort_key
+from games.scheduler import fetch_stream
+from games.search_index import get_app_index, suggest
+from games.steam_client import steam_unavailable
+from games.steam_cache import (
+    get_app_details_entry,
+    get_cached_game_details,
+    get_cached_game_minimal,
+    iter_fetchable_appids,
+)
 
 logger = logging.getLogger(__name__)
 
-
-def get_cached_game_minimal(appid):
-    """Get minimal game data for list view - much faster"""
-    cache_key = f'steam_game_minimal_{appid}'
-    game_data = cache.get(cache_key)
-
-    if game_data is None:
-        url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
-        try:
-            response = requests.get(url, timeout=2)  # Even shorter timeout
-            if response.status_code == 200:
-                data = response.json()
-                app_data = data.get(str(appid), {})
-                if app_data.get('success'):
-                    info = app_data.get('data', {})
-                    genres = info.get('genres', [])
-                    categories = info.get('categories', [])
-
-                    # Only get what we need for the list view
-                    game_data = {
-                        'appid': info.get('steam_appid'),
-                        'title': info.get('name', 'Unknown'),
-                        'image': info.get('header_image'),  # Add image back
-                        'platforms': info.get('platforms', {}),  # Windows, Mac, Linux
-                        'genres': genres[:2] if genres else [],  # Only first 2 genres
-                        'tags': categories[:2] if categories else [],  # Only first 2 tags
-                    }
-                    # Cache for 24 hours
-                    cache.set(cache_key, game_data, 86400)
-        except Exception:
-            pass
-
-    return game_data
-
-
-def get_cached_game_details(appid):
-    """Get full game details for detail view"""
-    cache_key = f'steam_game_full_{appid}'
-    game_data = cache.get(cache_key)
-
-    if game_data is None:
-        url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                app_data = data.get(str(appid), {})
-                if app_data.get('success'):
-                    info = app_data.get('data', {})
-                    game_data = {
-                        'appid': info.get('steam_appid'),
-                        'title': info.get('name', 'Unknown'),
-                        'developer': ', '.join(info.get('developers', [])),
-                        'publisher': ', '.join(info.get('publishers', [])),
-                        'release_date': info.get('release_date', {}).get('date', ''),
-                        'image': info.get('header_image'),
-                        'short_description': info.get('short_description', ''),
-                        'detailed_description': info.get('detailed_description', ''),
-                        'platforms': info.get('platforms', {}),
-                        'genres': info.get('genres', []),
-                        'tags': info.get('categories', []),
-                        'price_overview': info.get('price_overview', {}),
-                        'metacritic': info.get('metacritic', {}),
-                        'recommendations': info.get('recommendations', {}),
-                        # Add system requirements for PC, Mac, Linux
-                        'pc_requirements_minimum': info.get('pc_requirements', {}).get('minimum', ''),
-                        'mac_requirements_minimum': info.get('mac_requirements', {}).get('minimum', ''),
-                        'linux_requirements_minimum': info.get('linux_requirements', {}).get('minimum', ''),
-                    }
-                    # Cache for 24 hours
-                    cache.set(cache_key, game_data, 86400)
-        except Exception:
-            pass
-
-    return game_data
-
-
-def fetch_multiple_game_minimal(appids):
-    """Fetch multiple minimal game details concurrently"""
-    game_details = []
-
-    # Use ThreadPoolExecutor for concurrent API calls
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:  # More workers for lighter requests
-        # Submit all tasks
-        future_to_appid = {executor.submit(get_cached_game_minimal, appid): appid for appid in appids}
-
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_appid):
-            try:
-                game_data = future.result()
-                if game_data:
-                    game_details.append(game_data)
-            except Exception:
-                continue
-
-    return game_details
+# Card fetches a single request keeps queued or running: the batch of 30
+# being filtered plus the next one
+FETCH_WINDOW = 60
+# Steam candidates taken from fuzzy matching when a search has no direct hits
+FUZZY_RESULTS = 50
+# Steam candidates one infinite-scroll request inspects at most
+STEAM_SCAN_LIMIT = 1000
+# Cards on a server-rendered game_list page
+GAMES_PER_PAGE = 25
 
 
-def game_list(request):
-    # Unified DB-first merged flow:
-    steam_error = None
-
-    # Request params
+def game_list_filters(request):
+    """Canonical filters of a game_list request (see page_cache.canonical_filters)"""
     search_query = request.GET.get('search', '').strip()
     selected_platform = request.GET.get('platform', '')
     selected_genres = request.GET.getlist('genres')
@@ -134,172 +63,43 @@ def game_list(request):
     if not selected_tags and request.GET.get('tag'):
         selected_tags = [request.GET.get('tag')]
 
-    # Pagination params
-    games_per_page = 25
     try:
         page = int(request.GET.get('page', 1))
         if page < 1:
             page = 1
     except ValueError:
         page = 1
-    start_index = (page - 1) * games_per_page
-    end_index = start_index + games_per_page
+    return canonical_filters(search_query, selected_platform, selected_genres, selected_tags, page)
 
-    # Build DB queryset with filters applied
-    db_qs = Game.objects.all()
-    if search_query:
-        db_qs = db_qs.filter(title__icontains=search_query)
-    if selected_genres:
-        # Require ALL selected genres (AND semantics)
-        for gid in selected_genres:
-            db_qs = db_qs.filter(genres__genre_id=gid)
-        db_qs = db_qs.distinct()
-    if selected_tags:
-        # Require ALL selected tags (AND semantics)
-        for tid in selected_tags:
-            db_qs = db_qs.filter(tags__tag_id=tid)
-        db_qs = db_qs.distinct()
-    if selected_platform:
-        db_qs = db_qs.filter(platform__icontains=selected_platform)
-
-    db_count = db_qs.count()
-
-    # Slice DB results for this page (DB-first)
-    db_slice = list(db_qs[start_index:end_index]) if db_count > start_index else []
-
-    # Convert DB objects to minimal dicts expected by template
-    def db_game_to_dict(game):
-        genres = [{'description': genre.genre} for genre in game.genres.all()]
-        tags = [{'description': tag.name} for tag in game.tags.all()]
-        return {
-            'appid': getattr(game, 'game_id', None),
-            'game_id': getattr(game, 'game_id', None),
-            'title': game.title,
-            'image': game.image,
-            'platforms': {
-                'windows': 'windows' in (game.platform or '').lower(),
-                'mac': 'mac' in (game.platform or '').lower(),
-                'linux': 'linux' in (game.platform or '').lower(),
-            },
-            'genres': genres,
-            'tags': tags,
-        }
 
-    db_results = [db_game_to_dict(g) for g in db_slice]
-
-    # Determine how many API results we need to fill the page
-    needed = games_per_page - len(db_results)
-
-    # Prepare genre/tag lists for filters (cached)
-    genres_list = cache.get('steam_genres_list')
-    if genres_list is None:
-        genres_list = [(str(g.genre_id), g.genre) for g in Genre.objects.all()]
-        cache.set('steam_genres_list', genres_list, 3600)
-    tags_list = cache.get('steam_tags_list')
-    if tags_list is None:
-        tags_list = sorted([(str(t.tag_id), t.name) for t in Tag.objects.all()], key=lambda x: x[1])
-        cache.set('steam_tags_list', tags_list, 3600)
-
-    # Build set of DB appids to exclude from API results
-    db_appids = set()
-    for g in db_qs:
-        aid = getattr(g, 'game_id', None)
-        if aid is not None:
-            try:
-                db_appids.add(int(aid))
-            except Exception:
-                pass
-
-    api_results = []
-    total_api_candidates = 0
-
-    if needed > 0:
-        # Fetch Steam app list
-        all_apps = cache.get('steam_all_apps')
-        if all_apps is None:
-            try:
-                app_list_resp = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=10)
-                app_list_data = app_list_resp.json()
-                all_apps = app_list_data.get('applist', {}).get('apps', [])
-                cache.set('steam_all_apps', all_apps, 21600)
-            except Exception as e:
-                steam_error = f"Error fetching Steam app list: {e}"
-                all_apps = []
-
-        # Apply simple search filter on app name (case-insensitive)
-        filtered_apps = all_apps
-        if search_query:
-            ql = search_query.lower()
-            filtered_apps = [a for a in filtered_apps if ql in a.get('name', '').lower()]
-
-        # Exclude apps already present in DB
-        filtered_apps = [a for a in filtered_apps if int(a.get('appid', 0)) not in db_appids]
-
-        total_api_candidates = len(filtered_apps)
-
-        # Limit candidate pool for performance
-        candidate_limit = 3000 if search_query else 1500
-        filtered_apps = filtered_apps[:candidate_limit]
-
-        # If genre/tag filtering is requested we need to inspect details; fetch in batches
-        batch_size = 30
-        collected = 0
-        for i in range(0, len(filtered_apps), batch_size):
-            if collected >= needed:
-                break
-            batch = filtered_apps[i:i + batch_size]
-            appids = [a['appid'] for a in batch]
-            try:
-                details = fetch_multiple_game_minimal(appids)
-            except Exception:
-                details = []
-
-            for d in details:
-                if not d:
-                    continue
-                # Platform filter
-                if selected_platform:
-                    plats = d.get('platforms', {})
-                    sel_lower = selected_platform.lower()
-                    plats_windows = plats.get('windows')
-                    plats_mac = plats.get('mac')
-                    plats_linux = plats.get('linux')
-                    ok = False
-                    if 'windows' in sel_lower and plats_windows:
-                        ok = True
-                    elif 'mac' in sel_lower and plats_mac:
-                        ok = True
-                    elif 'linux' in sel_lower and plats_linux:
-                        ok = True
-                    if not ok:
-                        continue
-                # Genre filter (AND semantics)
-                if selected_genres:
-                    game_genre_ids = [str(g.get('id')) for g in d.get('genres', [])]
-                    if not all(gid in game_genre_ids for gid in selected_genres):
-                        continue
-                # Tag filter (AND semantics)
-                if selected_tags:
-                    game_tag_ids = [str(t.get('id')) for t in d.get('tags', [])]
-                    if not all(tid in game_tag_ids for tid in selected_tags):
-                        continue
-
-                api_results.append(d)
-                collected += 1
-                if collected >= needed:
-                    break
-
-    # Merge DB + API results for this page
-    merged_games = db_results + api_results
+def game_list(request):
+    # Unified DB-first merged flow:
 
-    # Estimate total results for pagination (DB + filtered API candidates)
-    estimated_total = db_count + total_api_candidates
-    # Fallback if both empty
-    if estimated_total == 0:
-        estimated_total = len(merged_games)
+    # Request params, in the canonical form the page is built from; the
+    # search box shows the query as typed, not its lowercased canonical form
+    filters = game_list_filters(request)
+    search_query = request.GET.get('search', '').strip()
+    selected_platform = filters['platform']
+    selected_genres = filters['genres']
+    selected_tags = filters['tags']
+    page = filters['page']
+
+    # Assembled pages are cached per canonical filter set until the games,
+    # labels or Steam catalog change. On a miss the page is sent with its
+    # DB cards only and game_list_fill_api streams in the Steam cards, so
+    # the response never waits on appdetails calls.
+    cache_key = page_cache_key(filters)
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload, _ = build_game_list_page(filters, GAMES_PER_PAGE)
+        if not payload['steam_pending'] and not payload['steam_error']:
+            cache.set(cache_key, payload, PAGE_CACHE_TTL)
+    merged_games = payload['games']
+    estimated_total = payload['estimated_total']
+    steam_error = payload['steam_error']
 
     # Create a simple paginator so templates can render page links
-    paginator = Paginator(range(estimated_total), games_per_page)
+    paginator = Paginator(range(estimated_total), GAMES_PER_PAGE)
     try:
         page_obj = paginator.page(page)
     except (PageNotAnInteger, EmptyPage):
@@ -323,12 +123,12 @@ def game_list(request):
     # Selected names for display
     selected_genres_with_names = [
         (genre_id, genre_name)
-        for genre_id, genre_name in genres_list
+        for genre_id, genre_name, _ in payload['genres']
         if genre_id in selected_genres
     ]
     selected_tags_with_names = [
         (tag_id, tag_name)
-        for tag_id, tag_name in tags_list
+        for tag_id, tag_name, _ in payload['tags']
         if tag_id in selected_tags
     ]
 
@@ -338,60 +138,251 @@ def game_list(request):
         {
             'steam_games': merged_games,
             'steam_error': steam_error,
+            'steam_unavailable': steam_unavailable(),
             'page_obj': page_obj,
             'query': search_query,
             'search_query': search_query,
-            'genres': genres_list,
-            'tags': tags_list,
+            'genres': payload['genres'],
+            'tags': payload['tags'],
             'selected_platform': selected_platform,
             'selected_genres': selected_genres,
             'selected_tags': selected_tags,
             'selected_genres_with_names': selected_genres_with_names,
             'selected_tags_with_names': selected_tags_with_names,
             'games': merged_games,
+            'steam_pending': payload['steam_pending'],
         }
     )
 
 
+def build_game_list_page(filters, games_per_page):
+    """
+    Assemble one game_list page for canonical filters: DB games first,
+    then Steam catalog games to fill the page, plus facet counts and the
+    estimated total for pagination.
+    Returns (payload, steam_cards). The payload holds the DB cards only;
+    steam_cards lazily yields the Steam cards that complete the page, and
+    only fetches appdetails once iterated.
+    """
+    steam_error = None
+    search_query = filters['search']
+    selected_platform = filters['platform']
+    selected_genres = filters['genres']
+    selected_tags = filters['tags']
+    page = filters['page']
+    start_index = (page - 1) * games_per_page
+    end_index = start_index + games_per_page
+
+    # Genre/tag/platform filters (AND semantics) are bitset ANDs over the
+    # in-process facet index, which also yields the per-facet counts
+    db_qs = Game.objects.order_by('game_id')
+    ranked_ids = None
+    if search_query:
+        # Ranked full-text match on title, developer and description,
+        # best match first
+        ranked_ids = list(search_games(search_query, db_qs).values_list('game_id', flat=True))
+    facets = get_facet_index().query(
+        selected_genres,
+        selected_tags,
+        selected_platform,
+        within=ranked_ids,
+    )
+
+    # Ids of the matching DB games in page order. Only this page's ids go
+    # back to the DB, never the whole (possibly table-sized) match set.
+    if selected_genres or selected_tags or selected_platform:
+        if ranked_ids is None:
+            matched_ids = facets.game_ids
+        else:
+            kept = set(facets.game_ids.tolist())
+            matched_ids = [game_id for game_id in ranked_ids if game_id in kept]
+    else:
+        matched_ids = ranked_ids
+
+    # Slice DB results for this page (DB-first); only card columns are loaded
+    # and genres/tags for the whole page come from one query each
+    if matched_ids is None:
+        db_count = db_qs.count()
+        db_results = game_cards(card_queryset(db_qs)[start_index:end_index]) if db_count > start_index else []
+    else:
+        db_count = len(matched_ids)
+        db_results = game_cards_by_id([int(game_id) for game_id in matched_ids[start_index:end_index]])
+
+    # Determine how many API results we need to fill the page
+    needed = games_per_page - len(db_results)
+
+    # Genre/tag lists for filters (cached until a Genre or Tag changes)
+    genres_list = genre_choices()
+    tags_list = tag_choices()
+
+    # Number of DB games each remaining genre/tag would narrow the results to
+    genre_facets = [(gid, name, facets.genre_counts.get(int(gid), 0)) for gid, name in genres_list]
+    tag_facets = [(tid, name, facets.tag_counts.get(int(tid), 0)) for tid, name in tags_list]
+
+    filtered_apps = []
+    total_api_candidates = 0
+
+    if needed > 0:
+        # Local Steam catalog and its prebuilt search index
+        try:
+            app_index = get_app_index()
+        except Exception as e:
+            steam_error = f"Error loading Steam catalog: {e}"
+            app_index = None
+
+        # Apply search filter on app name, ranked by relevance
+        if app_index is None:
+            source_apps = []
+        elif search_query:
+            # Fall back to fuzzy matches when nothing contains the query
+            source_apps = app_index.search(search_query) or app_index.fuzzy_search(search_query, FUZZY_RESULTS)
+        else:
+            source_apps = app_index.apps
+
+        # Exclude apps already stored as Game rows (their DB version is
+        # authoritative); only the candidates we keep are checked
+        db_appids = get_db_appids()
+        candidate_limit = 3000 if search_query else 1500
+        filtered_apps = list(islice(
+            (a for a in source_apps if a['appid'] not in db_appids),
+            candidate_limit,
+        ))
+
+        # Estimate of the remaining Steam candidates for pagination
+        total_api_candidates = max(len(source_apps) - len(db_appids), len(filtered_apps))
+
+    # Estimate total results for pagination (DB + filtered API candidates)
+    estimated_total = db_count + total_api_candidates
+    # Fallback if both empty
+    if estimated_total == 0:
+        estimated_total = len(db_results)
+
+    payload = {
+        'games': db_results,
+        'estimated_total': estimated_total,
+        'genres': genre_facets,
+        'tags': tag_facets,
+        'steam_error': steam_error,
+        'db_cards': len(db_results),
+        # Steam cards still to be appended to games
+        'steam_pending': bool(filtered_apps),
+    }
+    return payload, steam_cards(filtered_apps, filters, needed)
+
+
+def steam_cards(candidates, filters, needed):
+    """
+    Yield up to `needed` Steam card dicts for candidate apps that pass the
+    platform/genre/tag filters, in candidate order.
+    Details stream through the shared fetch scheduler: the next batch is
+    already in flight while this one is filtered, and closing the stream
+    once the page is full cancels everything still queued.
+    """
+    selected_platform = filters['platform']
+    selected_genres = filters['genres']
+    selected_tags = filters['tags']
+    collected = 0
+    # Appids Steam recently failed on are skipped before scheduling
+    details_stream = fetch_stream(
+        get_cached_game_minimal,
+        iter_fetchable_appids(a['appid'] for a in candidates),
+        window=FETCH_WINDOW,
+    )
+    try:
+        for d in details_stream:
+            if not d:
+                continue
+            # Platform filter
+            if selected_platform:
+                plats = d.get('platforms', {})
+                sel_lower = selected_platform.lower()
+                plats_windows = plats.get('windows')
+                plats_mac = plats.get('mac')
+                plats_linux = plats.get('linux')
+                ok = False
+                if 'windows' in sel_lower and plats_windows:
+                    ok = True
+                elif 'mac' in sel_lower and plats_mac:
+                    ok = True
+                elif 'linux' in sel_lower and plats_linux:
+                    ok = True
+                if not ok:
+                    continue
+            # Genre filter (AND semantics)
+            if selected_genres:
+                game_genre_ids = [str(g.get('id')) for g in d.get('genres', [])]
+                if not all(gid in game_genre_ids for gid in selected_genres):
+                    continue
+            # Tag filter (AND semantics)
+            if selected_tags:
+                game_tag_ids = [str(t.get('id')) for t in d.get('tags', [])]
+                if not all(tid in game_tag_ids for tid in selected_tags):
+                    continue
+
+            yield d
+            collected += 1
+            if collected >= needed:
+                break
+    finally:
+        details_stream.close()
+
+
+@require_http_methods(["GET"])
+def game_list_fill_api(request):
+    """
+    Steam cards completing a game_list page that was rendered with its DB
+    cards only, streamed as newline-delimited JSON (one card per line) as
+    their details resolve. The finished page is cached for game_list.
+    """
+    filters = game_list_filters(request)
+    cache_key = page_cache_key(filters)
+    payload = cache.get(cache_key)
+    if payload is not None:
+        # Already assembled; send its Steam cards in one go
+        cards = payload['games'][payload['db_cards']:]
+    else:
+        payload, cards = build_game_list_page(filters, GAMES_PER_PAGE)
+
+    def stream():
+        if payload['steam_pending']:
+            try:
+                for card in cards:
+                    payload['games'].append(card)
+                    yield json.dumps(card, cls=DjangoJSONEncoder) + '\n'
+            except Exception:
+                # Keep the cards sent so far; the page is not cached
+                logger.exception('Failed to fill game_list page with Steam cards')
+                return
+            payload['steam_pending'] = False
+            # A page filled while Steam was down may be missing cards
+            if not payload['steam_error'] and not steam_unavailable():
+                cache.set(cache_key, payload, PAGE_CACHE_TTL)
+        else:
+            for card in cards:
+                yield json.dumps(card, cls=DjangoJSONEncoder) + '\n'
+
+    return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+
 def game_detail(request, pk):
 
     # Try to get the game from the database first
     try:
-        db_game = Game.objects.get(game_id=pk)
-        # Convert genres and tags to list of dicts with 'description' key for template compatibility
-        genres = [{'description': genre.genre} for genre in db_game.genres.all()]
-        tags = [{'description': tag.name} for tag in db_game.tags.all()]
-        # Convert stored platform string to the dict shape the template expects
-        platform_str = (db_game.platform or '')
-        platforms_dict = {
-            'windows': 'windows' in platform_str.lower(),
-            'mac': 'mac' in platform_str.lower(),
-            'linux': 'linux' in platform_str.lower(),
-        }
-
-        game = {
-            'appid': db_game.game_id,
-            'title': db_game.title,
-            'developer': db_game.developer,
-            'release_date': db_game.release_date,
-            'image': db_game.image,
-            'description': db_game.short_description,
-            'genres': genres,
-            'tags': tags,
-            'platforms': platforms_dict,
-            'pc_requirements_minimum': db_game.pc_requirements_minimum,
-            'mac_requirements_minimum': db_game.mac_requirements_minimum,
-            'linux_requirements_minimum': db_game.linux_requirements_minimum,
-            # Add other fields as needed
-        }
+        # The only view that joins in the heavy GameDetail columns
+        db_game = Game.objects.select_related('detail').prefetch_related(*CARD_PREFETCH).get(game_id=pk)
+        game = game_detail_dict(db_game)
         return render(request, 'games/game_detail.html', {'game': game})
     except Game.DoesNotExist:
         # If not in DB, use the cached full details function for game detail page
         game = get_cached_game_details(pk)
+        unavailable = steam_unavailable()
         if game:
-            return render(request, 'games/game_detail.html', {'game': game})
+            return render(request, 'games/game_detail.html', {'game': game, 'steam_unavailable': unavailable})
         else:
-            error = 'Could not fetch game info from Steam.'
+            if unavailable:
+                error = 'Live Steam data is temporarily unavailable. Please try again later.'
+            else:
+                error = 'Could not fetch game info from Steam.'
             return render(request, 'games/game_detail.html', {'error': error})
 
 
@@ -400,26 +391,14 @@ def game_detail(request, pk):
 # It fetches game details from the Steam API using the appid, maps the fields,
 # creates the Game object, sets genres/tags, and redirects to the game detail page.
 def add_game_from_steam(request, appid):
-    url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
-            return render(
-                request,
-                'games/game_error.html',
-                {'error': 'Could not fetch game info from Steam (bad response).'}
-            )
-        data = response.json()
-        if not data:
-            return render(request, 'games/game_error.html', {'error': 'No data returned from Steam API.'})
-        app_data = data.get(str(appid))
-        if not app_data or not app_data.get('success'):
-            return render(request, 'games/game_error.html', {'error': 'Could not fetch game info from Steam.'})
-        info = app_data.get('data')
+        info, fetched_at = get_app_details_entry(appid)
         if not info:
-            return render(request, 'games/game_error.html', {'error': 'Game data missing from Steam API.'})
+            return render(request, 'games/game_error.html', {'error': 'Could not fetch game info from Steam.'})
         fields = map_steam_to_game(info, user=request.user)
         game = Game.objects.create(**fields)
+        archive_payload(info, fetched_at=fetched_at)
+        set_game_detail(game, info)
         set_game_genres_and_tags(game, info)
         # Redirect to game detail or list page
         return redirect('game_detail', pk=game.pk)
@@ -435,55 +414,27 @@ def search_suggestions_api(request):
     if len(query) < 2:
         return JsonResponse({'suggestions': []})
 
-    # Get cached app list for fast searching
-    all_apps = cache.get('steam_all_apps')
-    if not all_apps:
-        # Try to fetch if not cached
-        try:
-            app_list_url = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
-            response = requests.get(app_list_url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                all_apps = data.get('applist', {}).get('apps', [])
-                cache.set('steam_all_apps', all_apps, 21600)  # 6 hours
-            else:
-                all_apps = []
-        except Exception:
-            all_apps = []
-
-    if not all_apps:
+    # Top matches over the Steam catalog and DB titles: exact, then prefix,
+    # then word prefix, then substring, then typo-tolerant trigram matches
+    try:
+        matching_games = suggest(query, limit=8)
+    except Exception:
         return JsonResponse({'suggestions': []})
 
-    # Search through all games (not limited to 1000)
-    query_lower = query.lower()
-    matching_games = []
-
-    for app in all_apps:
-        if query_lower in app['name'].lower():
-            matching_games.append({
-                'appid': app['appid'],
-                'name': app['name']
-            })
-
-            # Limit suggestions to prevent overwhelming UI
-            if len(matching_games) >= 10:
-                break
-
-    # Prioritize exact matches and shorter names
-    matching_games.sort(key=lambda x: (
-        not x['name'].lower().startswith(query_lower),  # Exact matches first
-        len(x['name']),  # Shorter names first
-        x['name'].lower()  # Alphabetical
-    ))
-
-    return JsonResponse({'suggestions': matching_games[:8]})  # Return top 8 suggestions
+    return JsonResponse({'suggestions': matching_games})
 
 
 @require_http_methods(["GET"])
 def game_list_api(request):
-    """API endpoint for infinite scroll - returns JSON game data"""
-    page = int(request.GET.get('page', 1))
+    """
+    API endpoint for infinite scroll - returns JSON game data.
+    Pages are DB games first, then Steam catalog games. Each response
+    carries next_cursor, which the next request passes back as `cursor` to
+    resume in O(page size); `page` is only used for the first request after
+    the server-rendered page.
+    """
     search_query = request.GET.get('search', '').strip()
+    selected_platform = request.GET.get('platform', '')
 
     # Multi-select filters
     selected_genres = request.GET.getlist('genres')
@@ -495,114 +446,151 @@ def game_list_api(request):
     if not selected_tags and request.GET.get('tag'):
         selected_tags = [request.GET.get('tag')]
 
-    # Determine games per page based on whether it's first load or subsequent
-    games_per_page = 50 if page == 1 else 25
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            phase, after, position = decode_cursor(cursor)
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        page = None
+        games_per_page = 25
+        skip = 0
+    else:
+        try:
+            page = max(1, int(request.GET.get('page', 1)))
+        except ValueError:
+            page = 1
+        # Determine games per page based on whether it's first load or subsequent
+        games_per_page = 50 if page == 1 else 25
+        phase, after, position = DB, None, 0
+        skip = (page - 1) * games_per_page
 
     try:
-        # Check database first
-        db_games = Game.objects.all()
-        if db_games.exists():
-            # Apply filters
+        games = []
+        next_cursor = None
+
+        if phase == DB:
+            db_games = Game.objects.order_by('game_id')
+            ranked = bool(search_query)
             if search_query:
-                db_games = db_games.filter(title__icontains=search_query)
+                db_games = search_games(search_query, db_games)
             if selected_genres:
                 db_games = db_games.filter(genres__genre_id__in=selected_genres).distinct()
             if selected_tags:
                 db_games = db_games.filter(tags__tag_id__in=selected_tags).distinct()
-            if request.GET.get('platform'):
-                db_games = db_games.filter(platform__icontains=request.GET.get('platform'))
+            if selected_platform:
+                db_games = db_games.filter(platform_filter(selected_platform))
+
+            # One row past the page tells whether there is a next one;
+            # no COUNT(*) and no OFFSET beyond the first request
+            page_qs = card_queryset(after_key(db_games, after, ranked))
+            rows = list(page_qs[skip:skip + games_per_page + 1])
+            if len(rows) > games_per_page:
+                rows = rows[:games_per_page]
+                next_cursor = encode_cursor(DB, after=sort_key(rows[-1], ranked))
+            elif skip and not rows:
+                # An offset past the DB games carries over into Steam games
+                skip -= db_games.count()
+            else:
+                skip = 0
+            for card in game_cards(rows):
+                games.append({
+                    'appid': card['appid'],
+                    'title': card['title'],
+                    'image': card['image'],
+                    'platforms': card['platforms'],
+                    'genres': card['genres'][:2],
+                    'tags': card['tags'][:2],
+                })
+
+        if next_cursor is None and len(games) >= games_per_page:
+            # DB games ended exactly on this page; Steam games come next
+            next_cursor = encode_cursor(STEAM, position=0)
+        elif next_cursor is None:
+            steam_games, next_position = steam_page(
+                search_query,
+                selected_genres,
+                selected_tags,
+                selected_platform,
+                start=position,
+                skip=max(skip, 0),
+                count=games_per_page - len(games),
+            )
+            games.extend(steam_games)
+            if next_position is not None:
+                next_cursor = encode_cursor(STEAM, position=next_position)
 
-            # Pagination
-            paginator = Paginator(db_games, games_per_page)
-            try:
-                page_obj = paginator.page(page)
-            except (PageNotAnInteger, EmptyPage):
-                page_obj = paginator.page(1)
-            has_more = page_obj.has_next()
-
-            # Format games for frontend
-            games = []
-            for game in page_obj:
-                genres = [{'description': genre.genre} for genre in game.genres.all()]
-                game_dict = {
-                    'appid': getattr(game, 'game_id', None),
-                    'title': game.title,
-                    'image': game.image,
-                    'platforms': {'windows': 'windows' in (game.platform or '').lower(),
-                                  'mac': 'mac' in (game.platform or '').lower(),
-                                  'linux': 'linux' in (game.platform or '').lower()},
-                    'genres': genres[:2],
-                }
-                games.append(game_dict)
-
-            return JsonResponse({
-                'games': games,
-                'has_more': has_more,
-                'total_count': len(games),
-                'page': page
-            })
-        # If no games in DB, fallback to Steam API
-        steam_data = cache.get('steam_app_list')
-        if not steam_data:
-            try:
-                response = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=10)
-                if response.status_code == 200:
-                    steam_data = response.json()
-                    cache.set('steam_app_list', steam_data, 21600)
-                else:
-                    return JsonResponse({'error': 'Failed to fetch Steam data'}, status=500)
-            except Exception as e:
-                return JsonResponse({'error': f'Steam API error: {e}'}, status=500)
-
-        all_apps = steam_data['applist']['apps']
-        # Apply search filter
-        filtered_apps = all_apps
-        if search_query:
-            filtered_apps = [app for app in filtered_apps if search_query.lower() in app['name'].lower()]
-        # Limit for performance
-        filtered_apps = filtered_apps[:1000]
-
-        # Fetch minimal details for genre/tag filtering
-        games_minimal = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_appid = {
-                executor.submit(get_cached_game_minimal, app['appid']): app['appid']
-                for app in filtered_apps
-            }
-            for future in concurrent.futures.as_completed(future_to_appid):
-                game_data = future.result()
-                if game_data and game_data.get('title'):
-                    games_minimal.append(game_data)
-
-        # Apply genre/tag filters if present
-        if selected_genres:
+        return JsonResponse({
+            'games': games,
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'page': page,
+            'steam_unavailable': steam_unavailable(),
+        })
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+def steam_page(search_query, selected_genres, selected_tags, selected_platform, start, skip, count):
+    """
+    Up to `count` Steam catalog games from candidate position `start`
+    onwards, after dropping the first `skip` matches. Scans at most
+    STEAM_SCAN_LIMIT candidates. Returns (games, next position or None
+    when the candidates are exhausted).
+    """
+    app_index = get_app_index()
+    if search_query:
+        candidates = app_index.search(search_query) or app_index.fuzzy_search(search_query, FUZZY_RESULTS)
+    else:
+        candidates = app_index.apps
+    end = min(len(candidates), start + STEAM_SCAN_LIMIT)
+
+    # DB games were already served in the DB phase
+    db_appids = get_db_appids()
+    positions = (
+        (pos, candidates[pos]['appid'])
+        for pos in range(start, end)
+        if candidates[pos]['appid'] not in db_appids
+    )
+
+    def fetch(item):
+        pos, appid = item
+        return pos, get_cached_game_minimal(appid)
+
+    games = []
+    next_position = end
+    details_stream = fetch_stream(
+        fetch,
+        iter_fetchable_appids(positions, key=itemgetter(1)),
+        window=FETCH_WINDOW,
+    )
+    try:
+        for item in details_stream:
+            if item is None:
+                continue
+            pos, game_data = item
+            if not game_data or not game_data.get('title'):
+                continue
+            # Platform filter
+            if selected_platform and not game_data.get('platforms', {}).get(selected_platform.lower()):
+                continue
             # Keep games that contain ALL of the selected genres (AND semantics)
-            games_minimal = [
-                g for g in games_minimal
-                if all(
-                    str(sel_gid) in [str(genre.get('id')) for genre in g.get('genres', [])]
-                    for sel_gid in selected_genres
-                )
-            ]
-        if selected_tags:
+            if selected_genres:
+                game_genre_ids = [str(genre.get('id')) for genre in game_data.get('genres', [])]
+                if not all(str(sel_gid) in game_genre_ids for sel_gid in selected_genres):
+                    continue
             # Keep games that contain ALL of the selected tags (AND semantics)
-            games_minimal = [
-                g for g in games_minimal
-                if all(
-                    str(sel_tid) in [str(tag.get('id')) for tag in g.get('tags', [])]
-                    for sel_tid in selected_tags
-                )
-            ]
-
-        # Pagination
-        start_index = (page - 1) * games_per_page
-        end_index = start_index + games_per_page
-        paginated_games = games_minimal[start_index:end_index]
-        has_more = end_index < len(games_minimal)
-
-        # Format for frontend
-        games = []
-        for game_data in paginated_games:
+            if selected_tags:
+                game_tag_ids = [str(tag.get('id')) for tag in game_data.get('tags', [])]
+                if not all(str(sel_tid) in game_tag_ids for sel_tid in selected_tags):
+                    continue
+            if skip:
+                skip -= 1
+                continue
+            if len(games) >= count:
+                # This match starts the next page
+                next_position = pos
+                break
             games.append({
                 'appid': game_data.get('appid'),
                 'title': game_data.get('title'),
@@ -611,12 +599,7 @@ def game_list_api(request):
                 'genres': game_data.get('genres', [])[:2],
                 'tags': game_data.get('tags', [])[:2],
             })
+    finally:
+        details_stream.close()
 
-        return JsonResponse({
-            'games': games,
-            'has_more': has_more,
-            'total_count': len(games_minimal),
-            'page': page
-        })
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    return games, (next_position if next_position < len(candidates) else None)
@@ -0,0 +1,71 @@
+"""
+Cache warm-up after a deploy or restart.
+Builds the per-process indexes (catalog search, DB titles, membership,
+facets) and assembles the first pages of the default games list into the
+page cache, which is what the first visitors are served from.
+"""
+from django.core.cache import cache
+
+from games.facets import get_facet_index
+from games.labels import genre_choices, tag_choices
+from games.membership import get_db_appids
+from games.page_cache import PAGE_CACHE_TTL, canonical_filters, page_cache_key
+from games.search_index import get_app_index, get_title_index
+from games.steam_client import steam_unavailable
+from games.views import GAMES_PER_PAGE, build_game_list_page
+
+DEFAULT_PAGES = 3
+
+
+def warm_indexes():
+    """Build the in-process indexes and label lists; returns catalog size"""
+    index = get_app_index()
+    get_title_index()
+    get_db_appids()
+    get_facet_index()
+    genre_choices()
+    tag_choices()
+    return len(index)
+
+
+def warm_list_page(page):
+    """
+    Assemble page `page` of the unfiltered game_list, Steam cards
+    included, into the page cache. Returns True if the page is cached.
+    """
+    filters = canonical_filters('', '', [], [], page)
+    # Taken before building, as in game_list
+    cache_key = page_cache_key(filters)
+    if cache.get(cache_key) is not None:
+        return True
+    payload, cards = build_game_list_page(filters, GAMES_PER_PAGE)
+    payload['games'].extend(cards)
+    payload['steam_pending'] = False
+    # A page filled while Steam was down may be missing cards
+    if payload['steam_error'] or steam_unavailable():
+        return False
+    cache.set(cache_key, payload, PAGE_CACHE_TTL)
+    return True
+
+
+def warm_caches(pages=DEFAULT_PAGES, progress=None):
+    """
+    Warm the indexes and the first `pages` pages of the games list.
+    progress, if given, is called as progress(stage, done, total).
+    Returns a dict of counts per stage.
+    """
+    stats = {}
+
+    stats['catalog'] = warm_indexes()
+    if progress:
+        progress('indexes', 1, 1)
+
+    cached = 0
+    for page in range(1, pages + 1):
+        if warm_list_page(page):
+            cached += 1
+        if progress:
+            progress('pages', page, pages)
+    stats['pages'] = cached
+
+    return stats
@@ -0,0 +1,25 @@
+# Gunicorn loads this file automatically from the project root.
+import os
+import threading
+
+# Set WARM_CACHES_ON_BOOT=true to warm each worker's caches after it starts.
+# Warming runs in a background thread so the worker serves requests at once.
+WARM_CACHES_ON_BOOT = os.environ.get('WARM_CACHES_ON_BOOT', 'False').lower() == 'true'
+
+
+def post_worker_init(worker):
+    if not WARM_CACHES_ON_BOOT:
+        return
+
+    def warm():
+        from games.warmup import warm_caches
+
+        try:
+            stats = warm_caches(
+                pages=int(os.environ.get('WARM_CACHES_PAGES', '1')),
+            )
+            worker.log.info('Worker %s caches warmed: %s', worker.pid, stats)
+        except Exception:
+            worker.log.exception('Worker %s cache warm-up failed', worker.pid)
+
+    threading.Thread(target=warm, name='cache-warmup', daemon=True).start()
@@ -22,6 +22,7 @@ function throttle(fn, limit) {
 var GameListManager = class GameListManager {
 	constructor() {
 		this.currentPage = 1;
+		this.cursor = null;
 		this.loading = false;
 		this.hasMore = true;
 		this.searchQuery = "";
@@ -67,6 +68,12 @@ var GameListManager = class GameListManager {
 			this.setupSearch();
 			this.setupLoadMoreButton();
 
+			// The server sent the page with its DB games only; stream in the
+			// Steam games that complete it
+			if (this.gameContainer.dataset.fillUrl) {
+				this.fillPage(this.gameContainer.dataset.fillUrl);
+			}
+
 			// Check if we need to show load more button after a short delay
 			setTimeout(() => this.checkScrollability(), 500);
 		}
@@ -180,6 +187,7 @@ var GameListManager = class GameListManager {
 	handleSearch(query) {
 		// Reset pagination for new search
 		this.currentPage = 1;
+		this.cursor = null;
 		this.hasMore = true;
 		this.searchQuery = query;
 
@@ -200,7 +208,13 @@ var GameListManager = class GameListManager {
 
 		try {
 			const params = new URLSearchParams();
-			params.append("page", this.currentPage + 1);
+			// The cursor resumes where the last response stopped; the first
+			// request continues after the server-rendered page
+			if (this.cursor) {
+				params.append("cursor", this.cursor);
+			} else {
+				params.append("page", this.currentPage + 1);
+			}
 			params.append("search", this.searchQuery);
 			params.append("platform", this.selectedPlatform);
 
@@ -220,6 +234,7 @@ var GameListManager = class GameListManager {
 			if (response.ok) {
 				this.appendGames(data.games);
 				this.currentPage++;
+				this.cursor = data.next_cursor;
 				this.hasMore = data.has_more;
 
 				// Update URL without page refresh
@@ -238,6 +253,37 @@ var GameListManager = class GameListManager {
 		}
 	}
 
+	async fillPage(url) {
+		// Hold back infinite scroll until the page is complete
+		this.loading = true;
+		this.showLoadingSpinner();
+
+		try {
+			const response = await fetch(url);
+			if (!response.ok || !response.body) return;
+
+			// One JSON game per line, appended as each one arrives
+			const reader = response.body.getReader();
+			const decoder = new TextDecoder();
+			let buffered = "";
+			for (;;) {
+				const { done, value } = await reader.read();
+				if (done) break;
+				buffered += decoder.decode(value, { stream: true });
+				const lines = buffered.split("\n");
+				buffered = lines.pop();
+				const games = lines.filter((line) => line).map((line) => JSON.parse(line));
+				this.appendGames(games);
+			}
+		} catch (error) {
+			// The DB games are already shown; the next load picks up from there
+		} finally {
+			this.loading = false;
+			this.hideLoadingSpinner();
+			setTimeout(() => this.checkScrollability(), 100);
+		}
+	}
+
 	appendGames(games) {
 		if (!this.gameContainer || !games.length) return;
 
@@ -5,8 +5,9 @@ from .models import Wishlist, WishlistItem
 from .forms import WishlistForm
 from django.http import JsonResponse
 import json
-from games.models import Game, map_steam_to_game, set_game_genres_and_tags
-import requests
+from games.archive import archive_payload
+from games.models import Game, map_steam_to_game, set_game_detail, set_game_genres_and_tags
+from games.steam_cache import get_app_details_entry
 
 
 @login_required
@@ -199,17 +200,13 @@ def add_steam_game_to_wishlist(request, appid):
 
     # If still not found, call Steam API and create/find by appid or title
     if game is None:
-        url = f"https://store.steampowered.com/api/appdetails?appids={appid}"
         try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            app_data = data.get(str(appid), {})
+            info, fetched_at = get_app_details_entry(appid)
 
-            if not app_data.get('success'):
+            if not info:
                 messages.error(request, "Could not fetch game info from Steam.")
                 return redirect('game_list')
 
-            info = app_data['data']
             game_title = info.get('name', 'Unknown')
 
             # Try to create/find the game using Steam appid if available
@@ -218,6 +215,8 @@ def add_steam_game_to_wishlist(request, appid):
                     fields = map_steam_to_game(info, user=request.user)
                     game, created = Game.objects.get_or_create(game_id=appid_int, defaults=fields)
                     if created:
+                        archive_payload(info, fetched_at=fetched_at)
+                        set_game_detail(game, info)
                         set_game_genres_and_tags(game, info)
                 except Exception:
                     game = None
@@ -230,6 +229,8 @@ def add_steam_game_to_wishlist(request, appid):
                 except Game.DoesNotExist:
                     fields = map_steam_to_game(info, user=request.user)
                     game = Game.objects.create(**fields)
+                    archive_payload(info, fetched_at=fetched_at)
+                    set_game_detail(game, info)
                     set_game_genres_and_tags(game, info)
 
         except Exception as e: